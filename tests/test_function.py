@@ -11,6 +11,13 @@ from theflow.exceptions import CyclicPipelineError
 from .assets.sample_flow import Func, Multiply, Sum1, Sum2, callback
 
 
+class ListItems(Function):
+    items: list
+
+    def run(self):
+        return self.items
+
+
 class TestFunctionSaveAndLoad(TestCase):
     def test_save_ignore_auto_as_default(self):
         """By default, ignore_auto for the output"""
@@ -125,6 +132,17 @@ class TestFunctionSaveAndLoad(TestCase):
         obj2 = load(d, safe=False)
         self.assertEqual(obj.dump(), obj2.dump())
 
+    def test_load_does_not_share_containers(self):
+        """Loaded flows shouldn't share mutable params with each other or the dump"""
+        obj = ListItems(items=[1, 2])
+        d = obj.dump()
+        obj2 = load(d, safe=False)
+        obj3 = load(d, safe=False)
+        obj2.items.append(3)
+        self.assertEqual(obj3.items, [1, 2])
+        self.assertEqual(d["params"]["items"], [1, 2])
+        self.assertEqual(obj.items, [1, 2])
+
     def test_load_safe_without_module_raise_error(self):
         """Raise error if without supplied modules"""
         obj = Func(a=20, e=20, x=Sum1(a=20))
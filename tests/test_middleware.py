@@ -75,3 +75,26 @@ def test_log_error():
         f()
     assert "error" in f.last_run.logs(".")
     assert f.last_run.logs(".")["error"] == "division by zero"
+
+
+class A3(Function):
+    x: int = 1
+
+    def run(self, y, z=0):
+        return self.x + y + z
+
+
+class A4(A3):
+    class Config:
+        track_inputs = False
+
+
+def test_track_inputs():
+    f = A3(x=1)
+    f(2, z=3)
+    assert f.last_run.input(".") == {"args": (2,), "kwargs": {"z": 3}}
+    assert f.last_run.logs(".")["input"] == {"args": (2,), "kwargs": {"z": 3}}
+
+    f = A4(x=1)
+    f(2, z=3)
+    assert f.last_run.input(".") is None
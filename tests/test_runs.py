@@ -0,0 +1,199 @@
+import pickle
+import shutil
+import threading
+from pathlib import Path
+from unittest import TestCase
+
+from theflow.base import Function
+from theflow.runs.base import RunStructure, RunTracker, _progress_logs
+from theflow.storage import storage
+from theflow.utils.multiprocess import parallel
+
+
+class IncrementBy(Function):
+    x: int
+
+    class Config:
+        store_result = ".test_temporary"
+        middleware_switches = {"theflow.middleware.CachingMiddleware": False}
+
+    def run(self, y):
+        return self.x + y
+
+
+class Fail(Function):
+    class Config:
+        store_result = ".test_temporary"
+        middleware_switches = {"theflow.middleware.CachingMiddleware": False}
+
+    def run(self, y):
+        raise ValueError("failed")
+
+
+class Generate(Function):
+    class Config:
+        store_result = ".test_temporary"
+        middleware_switches = {"theflow.middleware.CachingMiddleware": False}
+
+    def run(self, n):
+        yield from range(n)
+
+
+class Repeat(Function):
+    class Config:
+        store_result = ".test_temporary"
+        middleware_switches = {"theflow.middleware.CachingMiddleware": False}
+
+    def run(self, text, times):
+        return text * times
+
+
+class ParallelPipeline(Function):
+    step: Function = Repeat.withx()
+
+    class Config:
+        store_result = ".test_temporary"
+        middleware_switches = {"theflow.middleware.CachingMiddleware": False}
+
+    def run(self, n):
+        # large outputs, so that the buffered log would be flushed by the workers
+        tasks = [{"text": "x", "times": 20000} for _ in range(n)]
+        return len(list(parallel(self, "step", tasks, processes=2)))
+
+
+class Pipeline(Function):
+    step1: Function
+    step2: Function
+
+    class Config:
+        store_result = ".test_temporary"
+        middleware_switches = {"theflow.middleware.CachingMiddleware": False}
+
+    def run(self, y):
+        y = self.step1(y)
+        return self.step2(y)
+
+
+def read_records(run_path: Path) -> list:
+    """Read the (name, value) records of the progress log of a run"""
+    records = []
+    with (run_path / RunStructure.progress_log).open("rb") as fi:
+        while True:
+            try:
+                records.append(pickle.load(fi))
+            except EOFError:
+                break
+    return records
+
+
+class TestRunProgressLog(TestCase):
+    def tearDown(self):
+        # the runs are stored under the storage prefix, not the working directory
+        shutil.rmtree(storage.url(".test_temporary"), ignore_errors=True)
+
+    def run_path(self, pipeline: Function) -> Path:
+        return Path(storage.url(pipeline.config.store_result, pipeline.last_run.id()))
+
+    def test_progress_log_records(self):
+        pipeline = Pipeline(step1=IncrementBy(x=1), step2=IncrementBy(x=2))
+        self.assertEqual(pipeline(y=10), 13)
+
+        run_path = self.run_path(pipeline)
+        self.assertFalse((run_path / RunStructure.progress).exists())
+        records = dict(read_records(run_path))
+        self.assertEqual(records[".step1"]["output"]["value"], 11)
+        self.assertEqual(records[".step2"]["output"]["value"], 13)
+        self.assertEqual(records["."]["output"]["value"], 13)
+        self.assertEqual(records["id"], pipeline.last_run.id())
+
+    def test_progress_log_written_before_crash(self):
+        """The steps that finished are kept even if the run fails"""
+        pipeline = Pipeline(step1=IncrementBy(x=1), step2=Fail())
+        with self.assertRaises(ValueError):
+            pipeline(y=10)
+
+        records = dict(read_records(self.run_path(pipeline)))
+        self.assertEqual(records[".step1"]["output"]["value"], 11)
+        self.assertEqual(records[".step2"]["error"], "failed")
+
+    def test_unpicklable_input_keeps_the_error(self):
+        """A step input that can't be written to the log doesn't hide the error"""
+        with self.assertRaises(ValueError):
+            Fail()(threading.Lock())
+        self.assertEqual(_progress_logs, {})
+
+    def test_generator_root_closes_log(self):
+        """The log of a generator root isn't kept open until it's consumed"""
+        pipeline = Generate()
+        output = pipeline(3)
+        self.assertEqual(_progress_logs, {})
+
+        self.assertEqual(list(output), [0, 1, 2])
+        records = dict(read_records(self.run_path(pipeline)))
+        self.assertEqual(records["."]["output"]["value"], [0, 1, 2])
+
+    def test_forked_workers_dont_write_to_log(self):
+        """The steps of the parallel workers are written once, by the parent"""
+        pipeline = ParallelPipeline()
+        self.assertEqual(pipeline(4), 4)
+
+        names = [name for name, _ in read_records(self.run_path(pipeline))]
+        steps = [name for name in names if name.startswith(".step")]
+        self.assertEqual(sorted(steps), [".step", ".step[1]", ".step[2]", ".step[3]"])
+        self.assertEqual(names.count("id"), 1)
+
+    def test_persist_appends_missing_steps(self):
+        """The steps that skip the progress log (e.g. set from another process) are
+        appended when the run is persisted"""
+        pipeline = Pipeline(step1=IncrementBy(x=1), step2=IncrementBy(x=2))
+        pipeline(y=10)
+        run_path = self.run_path(pipeline)
+
+        last_run = pipeline.last_run
+        last_run.open_log()
+        last_run._context.set(".extra", {"output": 1}, context=last_run._progress)
+        last_run.persist()
+
+        # the logged steps are written once, and the missing one is appended
+        records = read_records(run_path)
+        self.assertEqual(len(records), len(last_run.steps()))
+        self.assertEqual(records[-1], (".extra", {"output": 1}))
+        self.assertEqual(dict(records), last_run.logs(name=None))
+
+    def test_load(self):
+        pipeline = Pipeline(step1=IncrementBy(x=1), step2=IncrementBy(x=2))
+        pipeline(y=10)
+
+        run = RunTracker(pipeline, "__test_load__")
+        run.load(self.run_path(pipeline))
+        self.assertEqual(run.output(".step1")["value"], 11)
+        self.assertEqual(run.output()["value"], 13)
+
+    def test_load_truncated_log(self):
+        """A record cut off by a crashed run is skipped"""
+        pipeline = Pipeline(step1=IncrementBy(x=1), step2=IncrementBy(x=2))
+        pipeline(y=10)
+        run_path = self.run_path(pipeline)
+        records = read_records(run_path)
+
+        with (run_path / RunStructure.progress_log).open("ab") as fo:
+            fo.write(pickle.dumps((".truncated", {"output": 1}))[:-5])
+
+        run = RunTracker(pipeline, "__test_load_truncated__")
+        run.load(run_path)
+        self.assertEqual(run.logs(name=None), dict(records))
+        self.assertNotIn(".truncated", run.steps())
+
+    def test_load_legacy_progress_pickle(self):
+        pipeline = Pipeline(step1=IncrementBy(x=1), step2=IncrementBy(x=2))
+        pipeline(y=10)
+
+        run_path = Path(storage.url(".test_temporary", "legacy"))
+        run_path.mkdir(parents=True)
+        with (run_path / RunStructure.progress).open("wb") as fo:
+            pickle.dump({".": {"output": 5}, ".step1": {"output": 3}}, fo)
+
+        run = RunTracker(pipeline, "__test_load_legacy__")
+        run.load(run_path)
+        self.assertEqual(run.output(), 5)
+        self.assertEqual(run.output(".step1"), 3)
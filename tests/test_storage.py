@@ -0,0 +1,29 @@
+from theflow.storage.local import LocalStorage
+
+
+def test_local_storage_join_normalizes(tmp_path):
+    storage = LocalStorage(str(tmp_path))
+    assert storage.join("a", "b/") == "a/b"
+    assert storage.join("./a") == "a"
+    assert storage.join() == "."
+
+
+def test_local_storage_url_normalizes(tmp_path):
+    storage = LocalStorage(str(tmp_path))
+    assert storage.url("a", "b/") == str(tmp_path / "a" / "b")
+    assert storage.url("./a") == str(tmp_path / "a")
+    assert storage.url() == str(tmp_path)
+
+
+def test_local_storage_open(tmp_path):
+    storage = LocalStorage(str(tmp_path))
+    path = storage.join("run", "progress.log")
+    with storage.open(path, "w") as fo:
+        fo.write("hello")
+
+    assert storage.exists(path)
+    with storage.open(path, "r") as fi:
+        assert fi.read() == "hello"
+
+    storage.rm(path)
+    assert not storage.exists(path)
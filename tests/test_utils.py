@@ -12,7 +12,7 @@ from theflow.utils.documentation import (
 )
 from theflow.utils.hashes import naivehash
 from theflow.utils.modules import deserialize, import_dotted_string, serialize
-from theflow.utils.paths import is_name_matched, is_parent_of_child
+from theflow.utils.paths import _find_upward, is_name_matched, is_parent_of_child
 from theflow.utils.typings import input_signature
 
 from .assets.sample_flow import Func, Sum1, Sum2
@@ -218,6 +218,35 @@ class TestSerialize(TestCase):
             },
         )
 
+    def test_serialize_type_registered_later(self):
+        """A type registered after it is first serialized uses its serializer"""
+        from theflow.utils.modules import SERIALIZE_BY_TYPES
+
+        class Point:
+            def __init__(self, x):
+                self.x = x
+
+        with self.assertRaises(ValueError):
+            serialize(Point(1))
+
+        SERIALIZE_BY_TYPES[Point] = lambda point: {"x": point.x}
+        try:
+            self.assertEqual(serialize(Point(1)), {"x": 1})
+        finally:
+            del SERIALIZE_BY_TYPES[Point]
+
+        with self.assertRaises(ValueError):
+            serialize(Point(1))
+
+    def test_serialize_returns_new_containers(self):
+        """The serialized containers shouldn't be the input ones"""
+        value = {"a": [1, 2], "b": {"c": "d"}}
+        output = serialize(value)
+        self.assertEqual(output, value)
+        self.assertIsNot(output, value)
+        self.assertIsNot(output["a"], value["a"])
+        self.assertIsNot(output["b"], value["b"])
+
     @pytest.mark.skip(reason="TODO: not work yet")
     def test_serialize_type_annotation(self):
         """Type will be serialized mostly as is, except object will be dotted string"""
@@ -291,6 +320,15 @@ class TestDeserialize(TestCase):
             {"a": Function, "b": 6, "c": {"hello": Path}},
         )
 
+    def test_deserialize_returns_new_containers(self):
+        """The deserialized containers shouldn't be the input ones"""
+        value = {"a": [1, 2], "b": {"c": "d"}}
+        output = deserialize(value)
+        self.assertEqual(output, value)
+        self.assertIsNot(output, value)
+        self.assertIsNot(output["a"], value["a"])
+        self.assertIsNot(output["b"], value["b"])
+
     @pytest.mark.skip(reason="TODO: not work yet")
     def test_serialize_type_annotation(self):
         """Type will be serialized mostly as is, except object will be dotted string"""
@@ -376,41 +414,64 @@ class TestNaiveHash(TestCase):
 
     def test_hash_scalar_type(self):
         """Test work with int, float, bool, string"""
-        self.assertEqual(naivehash()(0), "d6c6d6b1491707dc57506e7dfb7cccba")
-        self.assertEqual(naivehash()(1), "67af089a4426724964d7927610a9c42f")
-        self.assertEqual(naivehash()(1.0), "66d5a3a7b42af4fadff4e4a8786be2cd")
-        self.assertEqual(naivehash()(True), "4d81551eb15eacaed010de3a792efad4")
-        self.assertEqual(naivehash()(False), "5e7c9fef3bfb150080ba7884ab0e20a3")
-        self.assertEqual(naivehash()(None), "825f629c731075490e37c1f220781b68")
-        self.assertEqual(naivehash()("hello"), "006892b196dd42e56ae296d46ba796f9")
-        self.assertEqual(naivehash()("1"), "751d4a188f5eeb3ad70989aefad475a3")
+        self.assertEqual(naivehash()(0), "991e940573928b0c4eb8a0d5703e8b8b")
+        self.assertEqual(naivehash()(1), "a67c84a9a919704fc42d5129c0e8814d")
+        self.assertEqual(naivehash()(1.0), "672da9404f5bf854b0eb8e03125dea91")
+        self.assertEqual(naivehash()(True), "7c46013ad3517a31685d289276143eac")
+        self.assertEqual(naivehash()(False), "f1da2e5ad3ef33b78e09ec283341a1b1")
+        self.assertEqual(naivehash()(None), "02995b864522fabf7a49749dfeda2529")
+        self.assertEqual(naivehash()("hello"), "becd7a8610c6143e19dccca05fa61601")
+        self.assertEqual(naivehash()("1"), "aceba7253ca5b6b34910e6d67938043e")
 
     def test_hash_list_tuple_dict_set_type(self):
-        self.assertEqual(naivehash()([]), "61699d460f9e05f95aae56e73b86e742")
-        self.assertEqual(naivehash()([1]), "5cc551296cd2d79ad6ace14e7bac72c4")
-        self.assertEqual(naivehash()([1, 2]), "cc0f2d78211dcda8bfd4ef80930c7982")
-        self.assertEqual(naivehash()([]), "61699d460f9e05f95aae56e73b86e742")
-        self.assertEqual(naivehash()([1]), "5cc551296cd2d79ad6ace14e7bac72c4")
-        self.assertEqual(naivehash()([1, 2]), "cc0f2d78211dcda8bfd4ef80930c7982")
-        self.assertEqual(naivehash()([2, 1]), "1c2bf5865c9df59d93bbcbe538b8663b")
-        self.assertEqual(naivehash()({}), "03f7e77c0cba63ae7a9c75ccfbfe33e0")
-        self.assertEqual(naivehash()({1: 2}), "b797b7645bcef16d8fce546ca5d1dc03")
-        self.assertEqual(naivehash()({"1": 2}), "7296fb42d9464d15a65e71f671b2e480")
+        self.assertEqual(naivehash()([]), "1d86e05577b306b290b0a29cce519fa1")
+        self.assertEqual(naivehash()([1]), "e6683e145e45c1b56cc641fb21ee0c93")
+        self.assertEqual(naivehash()([1, 2]), "e8c585a668d30e38a98687918b0a00d5")
+        self.assertEqual(naivehash()([]), "1d86e05577b306b290b0a29cce519fa1")
+        self.assertEqual(naivehash()([1]), "e6683e145e45c1b56cc641fb21ee0c93")
+        self.assertEqual(naivehash()([1, 2]), "e8c585a668d30e38a98687918b0a00d5")
+        self.assertEqual(naivehash()([2, 1]), "d7ce73a0a845b3c02fff283dafd02d99")
+        self.assertEqual(naivehash()({}), "527d3d5ac5d832d0fbfb3d5e7eca812f")
+        self.assertEqual(naivehash()({1: 2}), "556a2c0b70fe19c44b01aaca2538999c")
+        self.assertEqual(naivehash()({"1": 2}), "596c770a654368786ce5dc7f3cb17217")
         self.assertEqual(
-            naivehash()({(1, 2): A(1, 2)}), "345b31c73b28b9c3ffaa7d74b252702c"
+            naivehash()({(1, 2): A(1, 2)}), "db5b7c3025b3dd220f1732a02bf468c8"
         )
-        self.assertEqual(naivehash()(set()), "9ce70b11fda866035eb013c8de5b8692")
-        self.assertEqual(naivehash()({1, 2}), "84a6c62c58e7728fde564a8e3d295668")
-        self.assertEqual(naivehash()({2, 1}), "84a6c62c58e7728fde564a8e3d295668")
-        self.assertEqual(naivehash()({"1", "2"}), "26005d20f5d6a994175dc966c7892fae")
+        self.assertEqual(naivehash()(set()), "af622735888e15972a1da6355e02bb93")
+        self.assertEqual(naivehash()({1, 2}), "cf93575533149d3879d2c4eeda9847da")
+        self.assertEqual(naivehash()({2, 1}), "cf93575533149d3879d2c4eeda9847da")
+        self.assertEqual(naivehash()({"1", "2"}), "e08a0fc225d8ab6be4202a0923678ea5")
 
     def test_hash_python_cls(self):
-        self.assertEqual(naivehash()(A), "661461b328f78c906e1c3414829e8ef1")
-        self.assertEqual(naivehash()(B), "8a573a42d274081881992b0e0b9ed743")
+        self.assertEqual(naivehash()(A), "d5e64845a85b24fdf823f7401028a15f")
+        self.assertEqual(naivehash()(B), "780ca3020cc3121a0a009090a4a937fd")
 
     def test_hash_python_instance(self):
-        self.assertEqual(naivehash()(A(1, 2)), "a3b30166e8d9c76ec6fadc524618e702")
-        self.assertEqual(naivehash()(B(1, 2)), "9f3ae35d4506b1c469236d0c4707f79a")
+        self.assertEqual(naivehash()(A(1, 2)), "b8185a99296dbfe7d32801049694cb46")
+        self.assertEqual(naivehash()(B(1, 2)), "b0061e6a1afd9aea9c1914d664e3035e")
+
+    def test_hash_bytes(self):
+        self.assertEqual(naivehash()(b"ab"), naivehash()(b"ab"))
+        self.assertEqual(naivehash()(memoryview(b"ab")), naivehash()(memoryview(b"ab")))
+        self.assertNotEqual(naivehash()(b"ab"), naivehash()(b"ba"))
+        self.assertNotEqual(naivehash()(b"ab"), naivehash()(bytearray(b"ab")))
+
+    def test_hash_numpy_array(self):
+        np = pytest.importorskip("numpy")
+
+        array = np.arange(6, dtype=np.int64)
+        self.assertEqual(naivehash()(array), naivehash()(array.copy()))
+        self.assertNotEqual(naivehash()(array), naivehash()(array.reshape(2, 3)))
+        self.assertNotEqual(naivehash()(array), naivehash()(array.astype(np.int32)))
+        self.assertNotEqual(naivehash()(array), naivehash()(array + 1))
+
+        # equal items in different objects, the pointers in the buffer differ
+        objects = np.array([[1, 2], "a" * 3], dtype=object)
+        same_objects = np.array([[1, 2], "".join(["a", "aa"])], dtype=object)
+        self.assertEqual(naivehash()(objects), naivehash()(same_objects))
+        self.assertNotEqual(
+            naivehash()(objects), naivehash()(np.array([[1, 3], "aaa"], dtype=object))
+        )
 
 
 def test_input_signature_of_run():
@@ -428,3 +489,13 @@ def test_input_signature_of_run():
     assert list(sum2_input.keys()) == ["a", "b"], "Should ignore args, kwargs"
     assert sum2_args is True, "Should have *args"
     assert sum2_kwargs is True, "Should have **kwargs"
+
+
+def test_find_upward_after_created(tmp_path):
+    """A directory that isn't found is looked up again once it's created"""
+    loc = tmp_path / "project" / "sub"
+    loc.mkdir(parents=True)
+    assert _find_upward(str(loc), "__theflow_marker__") is None
+
+    (tmp_path / "project" / "__theflow_marker__").mkdir()
+    assert _find_upward(str(loc), "__theflow_marker__") == str(tmp_path / "project")
@@ -0,0 +1,107 @@
+import logging
+
+from theflow.visualization import trace_pipelne_run
+
+
+class Chain:
+    def run(self, x):
+        y = self.a(x)
+        z = self.b(y, extra=self.c(x))
+        return self.d(value=z, _ff_name="last")
+
+
+class Branches:
+    def run(self, x):
+        if x:
+            y = self.a(x)
+        else:
+            y = self.b(x)
+        if x:
+            z = self.c(y)
+        else:
+            z = self.c(y)
+        return self.d(z)
+
+
+class NestedIfExp:
+    def run(self, x):
+        y = self.a(x) if self.c(x) else (self.b(x) if self.d(x) else self.e(x))
+        return self.f(y)
+
+
+class KeywordCall:
+    def run(self, x):
+        y = self.a(x)
+        return self.b(value=self.c(y), other=y)
+
+
+class SubscriptCall:
+    def run(self, x):
+        y = self.steps[0](x)
+        return self.a(y)
+
+
+class NoRun:
+    def helper(self, x):
+        return self.a(x)
+
+
+def test_trace_chain():
+    assert trace_pipelne_run(Chain) == [
+        ("__begin__", "self.a"),
+        ("self.a", "self.b"),
+        ("__begin__", "self.c"),
+        ("self.c", "self.b"),
+        ("self.b", "last"),
+    ]
+
+
+def test_trace_branches_deduplicated():
+    flow = trace_pipelne_run(Branches)
+    assert len(flow) == len(set(flow))
+    assert set(flow) == {
+        ("__begin__", "self.a"),
+        ("__begin__", "self.b"),
+        ("self.a", "self.c"),
+        ("self.b", "self.c"),
+        ("self.c", "self.d"),
+    }
+
+
+def test_trace_nested_ifexp():
+    flow = trace_pipelne_run(NestedIfExp)
+    assert ("self.c", "self.a") in flow
+    assert ("self.c", "self.b") in flow
+    assert ("self.d", "self.b") in flow
+    assert ("self.d", "self.e") in flow
+    assert ("self.b", "self.f") in flow
+    assert ("self.e", "self.f") in flow
+    assert ("self.a", "self.f") in flow
+    assert all(isinstance(src, str) for src, _ in flow)
+
+
+def test_trace_keyword_call():
+    """The calls passed as keyword arguments are traced as the positional ones"""
+    assert trace_pipelne_run(KeywordCall) == [
+        ("__begin__", "self.a"),
+        ("self.a", "self.c"),
+        ("self.c", "self.b"),
+        ("self.a", "self.b"),
+    ]
+
+
+def test_trace_subscripted_call():
+    flow = trace_pipelne_run(SubscriptCall)
+    assert ("__begin__", "self.a") not in flow
+    assert [dst for _, dst in flow].count("self.a") == 1
+
+
+def test_trace_without_run():
+    assert trace_pipelne_run(NoRun) == []
+
+
+def test_trace_debug_logging(caplog):
+    with caplog.at_level(logging.DEBUG, logger="theflow.visualization"):
+        flow = trace_pipelne_run(Chain)
+    assert flow == trace_pipelne_run(Chain)
+    assert "Call: self.b" in caplog.text
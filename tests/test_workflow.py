@@ -46,6 +46,23 @@ class MultiprocessingWorkFlow(Function):
         return y
 
 
+class ParallelOptionsWorkFlow(Function):
+    increment_by: Function = IncrementBy.withx(x=1)
+
+    def run(self, ys, ordered=True, chunksize=None):
+        tasks = [{"y": y} for y in ys]
+        return list(
+            parallel(
+                self,
+                "increment_by",
+                tasks,
+                ordered=ordered,
+                chunksize=chunksize,
+                processes=2,
+            )
+        )
+
+
 class TestWorkflow(TestCase):
     def test_multiprocessing_output(self):
         flow = MultiprocessingWorkFlow()
@@ -58,6 +75,24 @@ class TestWorkflow(TestCase):
         self.assertEqual(output, 20)
         self.assertIn(".increment_by[1]", flow.last_run.logs(name=None))
 
+    def test_multiprocessing_ordered_with_chunksize(self):
+        ys = list(range(8))
+        for chunksize in (None, 1, 3):
+            flow = ParallelOptionsWorkFlow()
+            output = flow(ys, chunksize=chunksize)
+            self.assertEqual(output, [y + 1 for y in ys])
+
+    def test_multiprocessing_unordered(self):
+        ys = list(range(8))
+        flow = ParallelOptionsWorkFlow()
+        output = flow(ys, ordered=False, chunksize=1)
+        self.assertEqual(sorted(output), [y + 1 for y in ys])
+
+        logs = flow.last_run.logs(name=None)
+        self.assertIn(".increment_by", logs)
+        self.assertIn(".increment_by[7]", logs)
+        self.assertNotIn(".increment_by[8]", logs)
+
 
 def test_creating_sequential_function():
     flow = IncrementBy(x=10) >> DecrementBy(x=20) >> MultiplyBy(x=3)
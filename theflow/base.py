@@ -1653,6 +1653,8 @@ class ProxyFunction(Function):
     ff_original_obj: Callable
 
     def __init__(self, **params):
+        # {attribute name: (original callable, middleware-wrapped callable)}
+        self._ff_callables: dict[str, tuple[Callable, Callable]] = {}
         super().__init__(**params)
         if isinstance(self.ff_original_obj, ProxyFunction):
             raise ValueError(
@@ -1696,13 +1698,25 @@ class ProxyFunction(Function):
 
         return wrapper
 
+    def _get_callable(self, name: str, callable_obj: Callable) -> Callable:
+        """Get the middleware-wrapped callable, the middleware chain of each
+        attribute is built once and reused in later calls
+        """
+        cached = self._ff_callables.get(name)
+        if cached is not None and cached[0] == callable_obj:
+            return cached[1]
+
+        wrapped = self._create_callable(callable_obj)
+        self._ff_callables[name] = (callable_obj, wrapped)
+        return wrapped
+
     def __call__(self, *args, **kwargs):
         if self._ff_context is None:
             self._ff_context = deserialize(settings.CONTEXT, safe=False)
 
-        return self._create_callable(getattr(self.ff_original_obj, "__call__"))(
-            *args, **kwargs
-        )
+        return self._get_callable(
+            "__call__", getattr(self.ff_original_obj, "__call__")
+        )(*args, **kwargs)
 
     def __getattr__(self, name):
         if "ff_original_obj" not in self._ff_params:
@@ -1715,7 +1729,7 @@ class ProxyFunction(Function):
 
         attr = getattr(self.ff_original_obj, name)
         if callable(attr):
-            attr = self._create_callable(attr)
+            attr = self._get_callable(name, attr)
         return attr
 
     def run(self, *args, **kwargs) -> Any:
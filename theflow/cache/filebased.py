@@ -12,9 +12,13 @@ class FileCache(BaseCache):
 
     A file-based case that persist the cache in to a directory on disk. Suitable for
     different runs in different times to share the same cache.
+
+    Args:
+        path: the directory of the cache. If None, use the cache/ folder inside the
+            theflow temporary directory
     """
 
-    def __init__(self, path):
+    def __init__(self, path=None):
         try:
             import diskcache  # type: ignore
         except ImportError:
@@ -23,6 +27,13 @@ class FileCache(BaseCache):
                 "Please run: pip install diskcache"
             )
 
+        if path is None:
+            import os
+
+            from ..utils.paths import temp_path
+
+            path = os.path.join(temp_path(), "cache")
+
         path = str(path)
         if path not in _local_caches:
             _local_caches[path] = diskcache.Cache(path)
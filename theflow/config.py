@@ -18,6 +18,8 @@ class DefaultConfig:
     store_result = "{{ theflow.callbacks.store_result__pipeline_name }}"
     run_id = "{{ theflow.callbacks.run_id__timestamp }}"
     function_name = "{{ theflow.callbacks.function_name__class_name }}"
+    # skip logging the input of each step if set to False
+    track_inputs: bool = True
 
     # middleware
     middleware_section = "default"
@@ -104,6 +106,7 @@ class Config:
         store_result: "Path"
         run_id: str
         function_name: str
+        track_inputs: bool
         middleware_section: str
         middleware_switches: dict[str, bool]
         params_publish: bool
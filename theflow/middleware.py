@@ -2,6 +2,8 @@ import logging
 from abc import abstractmethod
 from typing import TYPE_CHECKING, Callable
 
+from .utils.paths import is_name_matched, is_parent_of_child
+
 if TYPE_CHECKING:
     from .base import Function
 
@@ -67,9 +69,9 @@ class SkipComponentMiddleware(Middleware):
             from_run = RunTracker(self.obj, "__from_run__")
             from_run.load(run_path=_ff_from_run)
 
-        if _from := self.obj.context.get("from", context=self.obj.fl.flow_qualidx):
-            from .utils.paths import is_parent_of_child
-
+        # fetch once, the same pattern is matched against the step name below
+        _from = self.obj.context.get("from", context=self.obj.fl.flow_qualidx)
+        if _from:
             if is_parent_of_child(self.obj.fl.name, _from):
                 self.obj.context.set("good_to_run", False, context=self.obj.fl.qualidx)
 
@@ -83,11 +85,7 @@ class SkipComponentMiddleware(Middleware):
             )
 
         if good_to_run is False:
-            from .utils.paths import is_name_matched
-
-            if is_name_matched(
-                _ff_name, self.obj.context.get("from", context=self.obj.fl.flow_qualidx)
-            ):
+            if _from is not None and is_name_matched(_ff_name, _from):
                 self.obj.context.set(
                     "good_to_run", True, context=self.obj.fl.parent_qualidx
                 )
@@ -128,20 +126,34 @@ class TrackProgressMiddleware(Middleware):
         import inspect
 
         abs_pathx = self.obj.fl.abs_path
-        if abs_pathx == ".":
+        # resolved per call: the same Function can be the root in one run and a
+        # child node in another
+        is_root = abs_pathx == "."
+        if is_root:
             from .runs.base import RunTracker
 
             last_run = RunTracker(self.obj)
             last_run.config = self.obj.config.dump()
             self.obj.last_run = last_run
+            last_run.open_log()
 
-        _input = {"args": args, "kwargs": kwargs}
+        _input = (
+            {"args": args, "kwargs": kwargs} if self.obj.config.track_inputs else None
+        )
         _output: dict = {"type": None, "value": None}
 
         try:
             output = self.next_call(*args, **kwargs)
         except Exception as e:
-            self.obj.log_progress(abs_pathx, input=_input, output=_output, error=str(e))
+            try:
+                self.obj.log_progress(
+                    abs_pathx, input=_input, output=_output, error=str(e)
+                )
+            except Exception as log_e:
+                logger.warning(f"Failed to log progress: {log_e}")
+            finally:
+                if is_root:
+                    last_run.close_log()  # type: ignore
             raise e from None
 
         if inspect.isgenerator(output):
@@ -155,7 +167,7 @@ class TrackProgressMiddleware(Middleware):
                 _output["value"] = logged_items
                 self.obj.log_progress(abs_pathx, input=_input, output=_output)
 
-                if abs_pathx == ".":
+                if is_root:
                     # will be set by the previous code
                     last_run.persist()  # type: ignore
 
@@ -177,9 +189,14 @@ class TrackProgressMiddleware(Middleware):
 
             logger.warning(f"Failed to log progress: {e}: {traceback.format_exc()}")
 
-        if abs_pathx == ".":
-            # will be set by the previous code
-            last_run.persist()  # type: ignore
+        if is_root:
+            try:
+                # will be set by the previous code
+                last_run.persist()  # type: ignore
+            finally:
+                # a generator root may never be consumed, don't keep its log open
+                # until then, the rest of its progress is persisted once exhausted
+                last_run.close_log()  # type: ignore
 
         return output
 
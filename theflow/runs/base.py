@@ -1,23 +1,32 @@
 from __future__ import annotations
 
+import logging
+import os
 import pickle
 import shutil
+import threading
 from pathlib import Path
-from typing import TYPE_CHECKING, Any
+from typing import IO, TYPE_CHECKING, Any
 
 import yaml
 
+try:
+    from yaml import CDumper as _YamlDumper
+except ImportError:
+    from yaml import Dumper as _YamlDumper  # type: ignore
+
 if TYPE_CHECKING:
     from ..base import Function
     from ..context import Context
 
-from ..storage import storage
+logger = logging.getLogger(__name__)
 
 
 class RunStructure:
     """The structure of a run directory"""
 
-    progress = "progress.pkl"
+    progress = "progress.pkl"  # legacy, superseded by progress_log
+    progress_log = "progress.log"
     input = "input.pkl"
     output = "output.pkl"
     config = "config.yaml"
@@ -69,6 +78,62 @@ class RunManager:
         shutil.rmtree(self.dir / name)
 
 
+class _ProgressLog:
+    """An append-only log that streams the progress of a run to storage
+
+    Each record is a pickled (name, value) pair, later records of the same name
+    override the earlier ones.
+
+    Only the process that opened the log writes to it: the processes forked while
+    it is open (e.g. the `parallel` workers) inherit the file object, their steps
+    reach the log through the context when the run is persisted.
+    """
+
+    def __init__(self, fo: IO[bytes]):
+        self.fo = fo
+        self.lock = threading.Lock()
+        self.names: set[str] = set()
+        self.pid = os.getpid()
+
+    def is_owner(self) -> bool:
+        """Whether the current process is the one that opened the log"""
+        return os.getpid() == self.pid
+
+    def write(self, name: str, value: Any):
+        if not self.is_owner():
+            return
+        record = _dump_record(name, value)
+        if record is None:
+            return
+        with self.lock:
+            self.fo.write(record)
+            self.names.add(name)
+
+    def close(self):
+        with self.lock:
+            self.fo.close()
+
+
+def _dump_record(name: str, value: Any) -> bytes | None:
+    """Pickle a (name, value) record of the progress log
+
+    The record is pickled before being written, so that a value that can't be
+    pickled doesn't leave a partial record in the log.
+
+    Returns:
+        the pickled record, None if the value can't be pickled
+    """
+    try:
+        return pickle.dumps((name, value))
+    except Exception as e:
+        logger.warning(f"Cannot write the progress of {name} to the run log: {e}")
+        return None
+
+
+# logs of the runs being recorded in this process, keyed by progress name
+_progress_logs: dict[str, _ProgressLog] = {}
+
+
 class RunTracker:
     """Define run-related methods to track the information in the run
 
@@ -104,6 +169,9 @@ class RunTracker:
         value.update(kwargs)
         self._context.set(name, value, context=self._progress)
 
+        if (progress_log := _progress_logs.get(self._progress)) is not None:
+            progress_log.write(name, value)
+
     def logs(self, name: str | None = None) -> dict:
         """Get the information of each step
 
@@ -130,7 +198,8 @@ class RunTracker:
             name: name of the pipeline or step.
 
         Returns:
-            input of the respective pipeline
+            input of the respective pipeline, as {"args": ..., "kwargs": ...}. None if
+            the input wasn't tracked (config `track_inputs` is False)
         """
         return self.logs(name=name)["input"]
 
@@ -145,13 +214,67 @@ class RunTracker:
         """
         return self.logs(name=name)["output"]
 
+    def open_log(self):
+        """Stream the progress of the run to storage as each step finishes
+
+        The steps are appended to `progress.log` in the run directory, so the
+        progress of a run is kept even if the run crashes, and `persist` doesn't
+        have to dump the whole progress at the end.
+        """
+        if not self._obj.config.store_result or self._progress in _progress_logs:
+            return
+
+        from ..storage import storage
+
+        dir = storage.join(self._obj.config.store_result, self.id())
+        fo = storage.open(storage.join(dir, RunStructure.progress_log), "wb")
+        progress_log = _ProgressLog(fo)
+        for name, value in self.logs(name=None).items():
+            progress_log.write(name, value)
+        _progress_logs[self._progress] = progress_log
+
+    def close_log(self) -> set[str]:
+        """Flush and close the progress log opened with `open_log`
+
+        Returns:
+            the names of the steps written to the log
+        """
+        progress_log = _progress_logs.get(self._progress)
+        if progress_log is None or not progress_log.is_owner():
+            # closing the file inherited by a forked process would flush the
+            # records buffered by the owner a second time
+            return set()
+        del _progress_logs[self._progress]
+        progress_log.close()
+        return progress_log.names
+
     def persist(self):
         """Persist the run result to a store"""
+        from ..storage import storage
+
+        progress_log = _progress_logs.get(self._progress)
+        if progress_log is not None and not progress_log.is_owner():
+            # the run is persisted by the process that opened its log
+            return
+
         dir = storage.join(self._obj.config.store_result, self.id())
-        with storage.open(storage.join(dir, "progress.pkl"), "wb") as fo:
-            pickle.dump(self.logs(name=None), fo)
+        logged = self.close_log()
+
+        # steps logged from other processes, or after the log is closed, are only
+        # available in the context
+        progress = self.logs(name=None)
+        missing = [name for name in progress if name not in logged]
+        if missing:
+            with storage.open(
+                storage.join(dir, RunStructure.progress_log), "ab" if logged else "wb"
+            ) as fo:
+                for name in missing:
+                    record = _dump_record(name, progress[name])
+                    if record is not None:
+                        fo.write(record)
+
         with storage.open(storage.join(dir, "config.yml"), "w") as fo:
-            yaml.dump(self._config, fo)
+            yaml.dump(self._config, fo, Dumper=_YamlDumper)
 
     def id(self) -> str:
         """Get the id of the run
@@ -168,8 +291,19 @@ class RunTracker:
             run_path: the path to the run
         """
         run_path = Path(run_path)
-        with (run_path / "progress.pkl").open("rb") as fi:
-            progress = pickle.load(fi)
+        progress: dict = {}
+        if (run_path / RunStructure.progress).exists():
+            with (run_path / RunStructure.progress).open("rb") as fi:
+                progress = pickle.load(fi)
+        else:
+            with (run_path / RunStructure.progress_log).open("rb") as fi:
+                while True:
+                    try:
+                        name, value = pickle.load(fi)
+                    except (EOFError, pickle.UnpicklingError):
+                        # end of log, or a record truncated by a crashed run
+                        break
+                    progress[name] = value
 
         for key, value in progress.items():
             self._context.set(key, value, context=self._progress)
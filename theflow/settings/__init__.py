@@ -1,10 +1,56 @@
 import os
 import sys
-from pathlib import Path
+from functools import lru_cache
+from types import ModuleType
+from typing import Tuple
 
 from . import default
 
 
+@lru_cache(maxsize=None)
+def _resolve_settings_module(
+    settings_module: str, search_dirs: Tuple[str, ...]
+) -> ModuleType:
+    """Find the setting module
+
+    The result is cached, so new Settings objects with the same environment don't
+    search and execute flowsettings.py again. Call
+    `_resolve_settings_module.cache_clear()` to search again.
+
+    Args:
+        settings_module: the dotted name of the setting module, from environment
+            variable THEFLOW_SETTINGS_MODULE. Ignored if empty
+        search_dirs: the directories to look for flowsettings.py, in priority order
+
+    Returns:
+        the setting module
+    """
+    import importlib
+
+    if settings_module:
+        return importlib.import_module(settings_module)
+
+    for flowsettings_dir in search_dirs:
+        if not flowsettings_dir:
+            continue
+        flowsettings_path = os.path.join(flowsettings_dir, "flowsettings.py")
+        if os.path.isfile(flowsettings_path):
+            import importlib.util
+
+            spec = importlib.util.spec_from_file_location(
+                "flowsettings", flowsettings_path
+            )
+
+            if spec is None or spec.loader is None:
+                continue
+
+            module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(module)
+            return module
+
+    return default
+
+
 class Settings:
     """A lazy setting module, will be initialized when first accessed
 
@@ -13,6 +59,9 @@ class Settings:
         2. with flowsettings.py in current working directory
         3. with flowsettings.py in sys.path
         4. with default settings specified in this package
+
+    The settings are the uppercase variables of the setting module. If the module
+    defines `__all__`, only the names listed there are used as settings.
     """
 
     def __init__(self):
@@ -21,53 +70,40 @@ class Settings:
 
     def load_settings(self):
         self._initialized = True
-
-        if (
-            "THEFLOW_SETTINGS_MODULE" in os.environ
-            and os.environ["THEFLOW_SETTINGS_MODULE"]
-        ):
-            import importlib
-
-            module = importlib.import_module(os.environ["THEFLOW_SETTINGS_MODULE"])
-            for setting in dir(module):
-                if setting.isupper():
-                    setattr(self, setting, getattr(module, setting))
-            return
-
-        flowsettings_acceptable_dirs: list[str] = [os.getcwd()] + sys.path
-        for flowsettings_dir in flowsettings_acceptable_dirs:
-            flowsettings_path = Path(flowsettings_dir) / "flowsettings.py"
-            if flowsettings_path.exists():
-                import importlib.util
-
-                spec = importlib.util.spec_from_file_location(
-                    "flowsettings", flowsettings_path
-                )
-
-                if spec is None or spec.loader is None:
-                    continue
-
-                module = importlib.util.module_from_spec(spec)
-                spec.loader.exec_module(module)
-                for setting in dir(module):
-                    if setting.isupper():
-                        setattr(self, setting, getattr(module, setting))
-                return
-
-        for setting in dir(default):
-            if setting.isupper():
-                setattr(self, setting, getattr(default, setting))
+        module = _resolve_settings_module(
+            os.environ.get("THEFLOW_SETTINGS_MODULE", ""),
+            # dedupe while keeping the priority order, "" in sys.path is the cwd
+            tuple(dict.fromkeys([os.getcwd(), *sys.path])),
+        )
+        self._update_from_module(module)
+
+    def _update_from_module(self, module):
+        """Set the variables in `__all__`, or the uppercase variables, of a module as
+        settings"""
+        names = getattr(module, "__all__", None)
+        if not names:
+            names = [key for key in vars(module) if key.isupper()]
+        self.__dict__.update((name, getattr(module, name)) for name in names)
 
     def __getattr__(self, item):
-        """Get the setting"""
+        """Get the setting
+
+        The loaded settings are stored in the instance dict, so once loaded, accessing
+        them doesn't go through here. Only the first access and the misses do.
+        """
         if not self._initialized:
             self.load_settings()
 
+        d = self.__dict__
+        if item in d:
+            # settings are usually accessed with their uppercase name already
+            return d[item]
+
         name = item.upper()
-        if name not in self.__dict__:
-            raise AttributeError(f"Setting {name} not found")
+        if name in d:
+            return d[name]
 
-        return getattr(self, name)
+        raise AttributeError(f"Setting {name} not found")
 
 
 settings = Settings()
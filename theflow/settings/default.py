@@ -1,15 +1,14 @@
 """Default setting for important variables"""
-from pathlib import Path
 
-from theflow.utils.paths import default_theflow_path, temp_path
+from theflow.utils.paths import default_theflow_path
 
 CONTEXT = {
     "__type__": "theflow.context.Context",
 }
 
+# without "path", FileCache uses the cache/ folder of the temporary directory
 CACHE = {
     "__type__": "theflow.cache.FileCache",
-    "path": str(Path(temp_path(), "cache")),
 }
 
 STORAGE = {
@@ -1,8 +1,27 @@
-from ..settings import settings
-from ..utils.modules import deserialize
-from .local import LocalStorage
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .local import LocalStorage
+
+
+def __getattr__(name: str) -> Any:
+    """Import the storage classes and create the project storage on first access,
+    rather than on import"""
+    if name == "LocalStorage":
+        from .local import LocalStorage
+
+        globals()["LocalStorage"] = LocalStorage
+        return LocalStorage
+
+    if name == "storage":
+        from ..settings import settings
+        from ..utils.modules import deserialize
+
+        obj = deserialize(settings.STORAGE, safe=False)
+        globals()["storage"] = obj
+        return obj
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-# make this lazy (created during first request)
-storage = deserialize(settings.STORAGE, safe=False)
 
 __all__ = ["LocalStorage", "storage"]
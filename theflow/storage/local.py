@@ -1,3 +1,4 @@
+import os
 from pathlib import Path
 from typing import Optional
 
@@ -13,20 +14,21 @@ class LocalStorage(BaseStorage):
 
     def __init__(self, prefix: str):
         self._prefix: Path = Path(prefix)
-        if not self._prefix.exists():
-            self._prefix.mkdir(parents=True)
+        self._prefix.mkdir(parents=True, exist_ok=True)
+        # the storage operations join with the str prefix through os.path, which
+        # avoids allocating Path objects on every call
+        self._prefix_str: str = str(self._prefix)
 
     def open(self, path: str, mode="rb", encoding: Optional[str] = None):
-        parent = (self._prefix / path).parent
-        if not parent.exists():
-            parent.mkdir(parents=True)
-        return open(self._prefix / path, mode=mode, encoding=encoding)
+        full_path = os.path.join(self._prefix_str, path)
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+        return open(full_path, mode=mode, encoding=encoding)
 
     def exists(self, path: str) -> bool:
-        return (self._prefix / path).exists()
+        return os.path.exists(os.path.join(self._prefix_str, path))
 
     def rm(self, path: str):
-        (self._prefix / path).unlink()
+        os.unlink(os.path.join(self._prefix_str, path))
 
     def join(self, *paths: str) -> str:
         return str(Path(*paths))
@@ -5,6 +5,7 @@ import importlib
 import inspect
 import pkgutil
 import sys
+from functools import lru_cache
 
 from ..base import Function, NodeAttr, ParamAttr
 
@@ -33,9 +34,17 @@ def get_function_documentation(func: type[Function]) -> dict:
                 }
             }
     """
+    # params and nodes are descriptors declared in the class bodies, read them from
+    # the class dicts rather than triggering every attribute with getattr
+    attrs: dict = {}
+    for klass in func.__mro__:
+        for name, attr in vars(klass).items():
+            if name.startswith("_") or name in attrs:
+                continue
+            attrs[name] = attr
+
     params, nodes = {}, {}
-    for name in dir(func):
-        attr = getattr(func, name)
+    for name, attr in sorted(attrs.items(), key=lambda item: item[0]):
         if isinstance(attr, ParamAttr):
             params[name] = {
                 "desc": attr._help,
@@ -62,6 +71,9 @@ def get_function_documentation(func: type[Function]) -> dict:
 def get_functions_from_module(module_path: str, recursive: bool = True) -> dict:
     """Get all Functions from module
 
+    The module scan is cached, so only the first call for each module imports and
+    introspects it.
+
     Args:
         module_path: The path to the module
 
@@ -69,6 +81,13 @@ def get_functions_from_module(module_path: str, recursive: bool = True) -> dict:
         A dictionary of Functions, with the key being the name of the function and the
         value being the Functions class itself.
     """
+    # copy so that the caller can't modify the cached result
+    return dict(_get_functions_from_module(module_path, recursive))
+
+
+@lru_cache(maxsize=None)
+def _get_functions_from_module(module_path: str, recursive: bool) -> dict:
+    """Get all Functions from module, see `get_functions_from_module`"""
     funcs: dict = {}
     module = sys.modules.get(module_path)
     if not (
@@ -78,18 +97,16 @@ def get_functions_from_module(module_path: str, recursive: bool = True) -> dict:
     ):
         module = importlib.import_module(module_path)
 
-    for name, obj in inspect.getmembers(module):
+    for _, obj in sorted(vars(module).items(), key=lambda item: item[0]):
         if inspect.isclass(obj) and issubclass(obj, Function) and obj != Function:
             if not obj.__module__.startswith(module_path):
                 # irrelevant import
                 continue
             funcs[f"{obj.__module__}.{obj.__name__}"] = obj
 
-    if recursive and "__path__" in dir(module):
+    if recursive and hasattr(module, "__path__"):
         for _, name, _ in pkgutil.iter_modules(module.__path__):
-            funcs.update(
-                get_functions_from_module(f"{module_path}.{name}", recursive=True)
-            )
+            funcs.update(_get_functions_from_module(f"{module_path}.{name}", True))
 
     return funcs
 
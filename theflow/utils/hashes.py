@@ -1,59 +1,93 @@
-from hashlib import md5
-from typing import Any
+import sys
+from hashlib import blake2b
+from typing import Any, Dict
+
+# type marker of str, used to frame the hashed content
+_STR_TYPE = f"{chr(0)}{str}{chr(0)}"
 
 
 class naivehash:
     """Hash a Python object
 
     Args:
-        hash_func: hash function to use. Default is md5
+        hash_func: hash function to use, called without argument to create the
+            hash object. Default is blake2b with a 16-byte digest
     """
 
+    # type marker of each hashed type, shared across instances
+    _type_strs: Dict[type, str] = {}
+
     def __init__(self, hash_func=None):
         """Initialize the hash object"""
-        self.hash_func = hash_func() if hash_func is not None else md5()
+        self.hash_func = (
+            hash_func() if hash_func is not None else blake2b(digest_size=16)
+        )
+        self._h = self.hash_func.update
 
     def update(self, obj: Any):
         """Hash a Python object
 
+        The framing strings are fed to the hash function directly, with the same
+        bytes that `self.update(framing_string)` would produce.
+
         Args:
             obj: Python object to be hashed
 
         Returns:
             hash of the object
         """
-        type_ = f"{chr(0)}{type(obj)}{chr(0)}"
+        h = self._h
+        t = type(obj)
+        type_ = self._type_strs.get(t)
+        if type_ is None:
+            type_ = self._type_strs[t] = f"{chr(0)}{t}{chr(0)}"
         if isinstance(obj, (str, int, float, bool)) or obj is None:
-            self.hash_func.update(f"|{type_}|{obj}".encode())
+            h(f"|{type_}|{obj}".encode())
         elif isinstance(obj, (tuple, list)):
-            self.update(f"|{type_}|")
+            h(f"|{_STR_TYPE}||{type_}|".encode())
             for idx, item in enumerate(obj):
-                self.update(f"|{type_}{idx}|")
+                h(f"|{_STR_TYPE}||{type_}{idx}|".encode())
                 self.update(item)
         elif isinstance(obj, set):
-            self.update(f"|{type_}|")
+            h(f"|{_STR_TYPE}||{type_}|".encode())
             for idx, item in enumerate(sorted(obj)):
-                self.update(f"|{type_}{idx}|")
+                h(f"|{_STR_TYPE}||{type_}{idx}|".encode())
                 self.update(item)
         elif isinstance(obj, dict):
-            self.update(f"|{type_}|")
-            for idx, key in enumerate(sorted(obj)):
-                self.update(f"|{type_}{idx}|")
+            h(f"|{_STR_TYPE}||{type_}|".encode())
+            items = sorted(obj.items(), key=lambda item: item[0])
+            for idx, (key, value) in enumerate(items):
+                h(f"|{_STR_TYPE}||{type_}{idx}|".encode())
                 self.update(key)
-                self.update(obj[key])
+                self.update(value)
+        elif isinstance(obj, (bytes, bytearray, memoryview)):
+            # feed the buffer as-is rather than walking its attributes
+            h(f"|{type_}|".encode())
+            h(obj)
+        elif (np := sys.modules.get("numpy")) is not None and isinstance(
+            obj, np.ndarray
+        ):
+            # an ndarray can only exist if numpy is already imported, so there is
+            # no need to import it here
+            h(f"|{type_}|{obj.dtype}|{obj.shape}|".encode())
+            if obj.dtype.hasobject:
+                # the buffer holds pointers to the items, hash the items instead
+                self.update(obj.tolist())
+            else:
+                h(obj.tobytes())
         else:
             path = ""
             path += str(obj.__module__) if hasattr(obj, "__module__") else ""
             path += str(obj.__name__) if hasattr(obj, "__name__") else ""
-            self.update(f"|{type_}|{path}|")
+            h(f"|{_STR_TYPE}||{type_}|{path}|".encode())
 
             for idx, attr in enumerate(sorted(dir(obj))):
                 if attr.startswith("_"):
                     continue
-                self.update(f"|{type_}{idx}|")
-                self.update(attr)
+                h(f"|{_STR_TYPE}||{type_}{idx}|".encode())
+                h(f"|{_STR_TYPE}|{attr}".encode())
                 # avoid self.update(getattr(obj, attr)) to avoid infinite recursion
-                self.update(str(getattr(obj, attr)))
+                h(f"|{_STR_TYPE}|{getattr(obj, attr)}".encode())
 
     def __call__(self, obj: Any) -> str:
         """Return the hash digest"""
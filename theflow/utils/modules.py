@@ -2,11 +2,24 @@ import importlib
 import inspect
 import logging
 import sys
+import weakref
 from pathlib import Path
-from typing import Any, Dict, Generic, Optional, Type, TypeVar
+from typing import Any, Callable, Dict, Generic, Optional, Type, TypeVar
 
 logger = logging.getLogger(__name__)
 NATIVE_TYPE = (dict, list, tuple, str, int, float, bool, type(None))
+# exact-type lookup, cheaper than isinstance for the common non-subclassed values
+_NATIVE_TYPES = frozenset(NATIVE_TYPE)
+_CONTAINER_TYPES = frozenset((dict, list, tuple))
+_SCALAR_NATIVE_TYPES = _NATIVE_TYPES - _CONTAINER_TYPES
+# the scalars that are returned as-is by deserialize, unlike str
+_NON_STR_SCALAR_TYPES = _SCALAR_NATIVE_TYPES - {str}
+# interned, so that the module names (interned by Python) compare by identity
+_BUILTINS = sys.intern("builtins")
+_TYPING = sys.intern("typing")
+_TYPE_KEY = sys.intern("__type__")
+# dotted string -> imported object, filled by cached_import
+_IMPORT_CACHE: Dict[str, Any] = {}
 
 
 def import_dotted_string(
@@ -34,7 +47,30 @@ def import_dotted_string(
 
         return allowed_modules[dotted_string]
 
-    module_name, obj_name = dotted_string.rsplit(".", 1)
+    return cached_import(dotted_string)
+
+
+def cached_import(dotted_string: str) -> Any:
+    """Import an object from its dotted string, without restriction
+
+    The result is cached, so resolving the same dotted string again (e.g. the same
+    `__type__` across many nodes of a flow) is a single dict lookup. Failed imports
+    are not cached.
+
+    Args:
+        dotted_string: the dotted string to import, e.g. "pathlib.Path"
+
+    Returns:
+        the imported object
+    """
+    try:
+        return _IMPORT_CACHE[dotted_string]
+    except KeyError:
+        pass
+
+    module_name, _, obj_name = dotted_string.rpartition(".")
+    if not module_name:
+        raise ValueError(f"{dotted_string} is not a dotted string")
     module = sys.modules.get(module_name)
 
     if not (
@@ -44,7 +80,8 @@ def import_dotted_string(
     ):
         module = importlib.import_module(module_name)
 
-    return getattr(module, obj_name)
+    obj = _IMPORT_CACHE[dotted_string] = getattr(module, obj_name)
+    return obj
 
 
 def serialize_path(path: Path) -> dict:
@@ -56,9 +93,32 @@ def serialize_path(path: Path) -> dict:
     return {"__type__": "pathlib.Path", "path": str(path)}
 
 
-SERIALIZE_BY_TYPES = {
+SERIALIZE_BY_TYPES: Dict[type, Callable] = {
     Path: serialize_path,
 }
+# exact type -> (size of SERIALIZE_BY_TYPES, its closest base in SERIALIZE_BY_TYPES
+# or None), so the MRO is walked once per type until a type is registered. Weakly
+# keyed, the serialized classes aren't kept alive by the cache
+_RESOLVED_SERIALIZERS: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+
+def _get_serializer(type_: type) -> Optional[Callable]:
+    """Get the serializer of the closest base of `type_` in SERIALIZE_BY_TYPES
+
+    Returns:
+        the serializer, None if none of the bases is registered
+    """
+    version = len(SERIALIZE_BY_TYPES)
+    resolved = _RESOLVED_SERIALIZERS.get(type_)
+    if resolved is None or resolved[0] != version:
+        base = next(
+            (base for base in type_.mro()[:-1] if base in SERIALIZE_BY_TYPES), None
+        )
+        resolved = _RESOLVED_SERIALIZERS[type_] = (version, base)
+
+    if resolved[1] is None:
+        return None
+    return SERIALIZE_BY_TYPES.get(resolved[1])
 
 
 def import_modules(*module_names: str) -> tuple:
@@ -96,18 +156,86 @@ def import_modules(*module_names: str) -> tuple:
     return tuple(modules)
 
 
-def serialize(value: Any) -> Any:
-    """Serialize a value to a JSON-serializable object"""
-    if isinstance(value, dict):
-        return {key: serialize(val) for key, val in value.items()}
+def _container_type(value: Any) -> Optional[type]:
+    """Get the container type (dict, list or tuple) that the value is handled as
+
+    Returns:
+        dict, list or tuple if the value is an instance of it, None otherwise
+    """
+    type_ = type(value)
+    if type_ in _CONTAINER_TYPES:
+        return type_
+
+    if type_ in _SCALAR_NATIVE_TYPES:
+        return None
+
+    for container_type in (dict, list, tuple):
+        if isinstance(value, container_type):
+            return container_type
 
-    if isinstance(value, list):
-        return [serialize(val) for val in value]
+    return None
 
-    if isinstance(value, tuple):
-        return tuple(serialize(val) for val in value)
 
-    if isinstance(value, NATIVE_TYPE):
+def _rebuild(
+    value: Any,
+    convert: Callable[[Any], Any],
+    resolve_type: Optional[Callable[[str], Any]] = None,
+) -> Any:
+    """Rebuild a nested dict/list/tuple value into native containers
+
+    The value is walked with an explicit stack instead of recursion, so deeply nested
+    values don't need a Python frame per node.
+
+    Args:
+        value: the value to rebuild
+        convert: called on each item that isn't a dict, list or tuple, the result is
+            used as-is
+        resolve_type: if set, a dict with "__type__" is rebuilt into an object:
+            this is called on the "__type__" value to get the class, which is then
+            initialized with the other rebuilt items of the dict
+
+    Returns:
+        the rebuilt value
+    """
+    root: list = [None]
+    stack: list = [(value, root, 0)]
+
+    # tuples and objects can only be created after their items are rebuilt, they are
+    # finished in reverse creation order so that the inner ones come first
+    pending: list = []
+
+    while stack:
+        item, parent, slot = stack.pop()
+        container_type = _container_type(item)
+
+        if container_type is None:
+            parent[slot] = convert(item)
+        elif container_type is dict:
+            if resolve_type is not None and _TYPE_KEY in item:
+                cls = resolve_type(item[_TYPE_KEY])
+                out: Any = {key: None for key in item if key != _TYPE_KEY}
+                pending.append((parent, slot, cls, out))
+            else:
+                out = dict.fromkeys(item)
+                parent[slot] = out
+            stack.extend([(item[key], out, key) for key in out])
+        else:
+            out = [None] * len(item)
+            if container_type is tuple:
+                pending.append((parent, slot, tuple, out))
+            else:
+                parent[slot] = out
+            stack.extend([(val, out, idx) for idx, val in enumerate(item)])
+
+    for parent, slot, cls, out in reversed(pending):
+        parent[slot] = tuple(out) if cls is tuple else cls(**out)
+
+    return root[0]
+
+
+def _serialize_item(value: Any) -> Any:
+    """Serialize a value that isn't a dict, list or tuple"""
+    if type(value) in _SCALAR_NATIVE_TYPES or isinstance(value, NATIVE_TYPE):
         return value
 
     if inspect.isfunction(value) or inspect.isclass(value):
@@ -119,14 +247,15 @@ def serialize(value: Any) -> Any:
         d = value.__persist_flow__()
         return d
 
-    for base in value.__class__.mro()[:-1]:
-        if base in SERIALIZE_BY_TYPES:
-            return SERIALIZE_BY_TYPES[base](value)
+    serializer = _get_serializer(type(value))
+    if serializer is not None:
+        return serializer(value)
 
-    if value.__module__ == "builtins":
-        return f"{{{{ {value.__module__}.{value.__name__} }}}}"
+    module = value.__module__
+    if module is _BUILTINS or module == _BUILTINS:
+        return f"{{{{ {module}.{value.__name__} }}}}"
 
-    if value.__module__ == "typing":
+    if module is _TYPING or module == _TYPING:
         name = ""
         if hasattr(value, "__name__"):
             name = value.__name__
@@ -134,13 +263,70 @@ def serialize(value: Any) -> Any:
             name = value._name
         else:
             raise ValueError(f"Cannot serialize {value}. Unknown name")
-        return f"{{{{ {value.__module__}.{name} }}}}"
+        return f"{{{{ {module}.{name} }}}}"
 
     raise ValueError(
         f"Cannot serialize {value}. Consider implementing __persist_flow__"
     )
 
 
+def serialize(value: Any) -> Any:
+    """Serialize a value to a JSON-serializable object"""
+    type_ = type(value)
+    if type_ in _SCALAR_NATIVE_TYPES:
+        # most common case: the leaves of containers
+        return value
+
+    if _container_type(value) is None:
+        return _serialize_item(value)
+
+    return _rebuild(value, _serialize_item)
+
+
+def _deserialize_item(
+    value: Any, safe=True, allowed_modules: Optional[Dict[str, Type]] = None
+) -> Any:
+    """Deserialize a value that isn't a dict, list or tuple"""
+    type_ = type(value)
+    if type_ in _NON_STR_SCALAR_TYPES:
+        return value
+
+    if type_ is str:
+        # most strings aren't "{{ ... }}" markers, index the chars rather than
+        # calling startswith/endswith
+        if (
+            len(value) >= 4
+            and value[0] == "{"
+            and value[1] == "{"
+            and value[-2] == "}"
+            and value[-1] == "}"
+        ):
+            if (
+                value[2] == " "
+                and value[-3] == " "
+                and not value[3].isspace()
+                and not value[-4].isspace()
+            ):
+                # canonical "{{ x }}" as written by serialize, no need to strip
+                dotted_string = value[3:-3]
+            else:
+                dotted_string = value[2:-2].strip()
+            return import_dotted_string(
+                dotted_string, safe=safe, allowed_modules=allowed_modules
+            )
+        return value
+
+    if isinstance(value, str) and value.startswith("{{") and value.endswith("}}"):
+        return import_dotted_string(
+            value[2:-2].strip(), safe=safe, allowed_modules=allowed_modules
+        )
+
+    if type(value) in _NATIVE_TYPES or isinstance(value, NATIVE_TYPE):
+        return value
+
+    raise ValueError(f"Cannot deserialize type {type(value)} ({value})")
+
+
 def deserialize(
     value: Any, /, safe=True, allowed_modules: Optional[Dict[str, Type]] = None
 ) -> Any:
@@ -151,44 +337,23 @@ def deserialize(
         safe: if True, only allowed modules can be imported
         allowed_modules: dict of allowed modules
     """
-    if isinstance(value, str) and value.startswith("{{") and value.endswith("}}"):
-        return import_dotted_string(
-            value[2:-2].strip(), safe=safe, allowed_modules=allowed_modules
-        )
-
-    if isinstance(value, dict) and "__type__" in value:
-        cls = import_dotted_string(
-            value["__type__"], safe=safe, allowed_modules=allowed_modules
-        )
-        params: dict = {}
-        for key, val in value.items():
-            if key == "__type__":
-                continue
-            params[key] = deserialize(val, safe=safe, allowed_modules=allowed_modules)
-        return cls(**params)
-
-    if isinstance(value, dict) and "__type__" not in value:
-        return {
-            key: deserialize(val, safe=safe, allowed_modules=allowed_modules)
-            for key, val in value.items()
-        }
-
-    if isinstance(value, list):
-        return [
-            deserialize(val, safe=safe, allowed_modules=allowed_modules)
-            for val in value
-        ]
-
-    if isinstance(value, tuple):
-        return tuple(
-            deserialize(val, safe=safe, allowed_modules=allowed_modules)
-            for val in value
-        )
-
-    if isinstance(value, NATIVE_TYPE):
+    type_ = type(value)
+    if type_ in _NON_STR_SCALAR_TYPES:
+        # most common case, and they never need to be deserialized
         return value
 
-    raise ValueError(f"Cannot deserialize type {type(value)} ({value})")
+    if _container_type(value) is None:
+        return _deserialize_item(value, safe=safe, allowed_modules=allowed_modules)
+
+    return _rebuild(
+        value,
+        lambda item: _deserialize_item(
+            item, safe=safe, allowed_modules=allowed_modules
+        ),
+        lambda dotted_string: import_dotted_string(
+            dotted_string, safe=safe, allowed_modules=allowed_modules
+        ),
+    )
 
 
 T = TypeVar("T")
@@ -204,16 +369,18 @@ class lazy(Generic[T]):
     def __init__(self, cls: Type[T], **params):
         self._cls: Type[T] = cls
         self._params: dict = params
+        # (key, is lazy, value) of the params, built on the first call
+        self._plan: Optional[list] = None
 
     def __call__(self) -> T:
         """Initialize the object"""
-        params = {}
-        for key, val in self._params.items():
-            if isinstance(val, lazy):
-                params[key] = val()
-            else:
-                params[key] = val
+        plan = self._plan
+        if plan is None:
+            plan = self._plan = [
+                (key, isinstance(val, lazy), val) for key, val in self._params.items()
+            ]
 
+        params = {key: val() if is_lazy else val for key, is_lazy, val in plan}
         return self._cls(**params)
 
     def withx(self, **params) -> "lazy[T]":
@@ -223,7 +390,7 @@ class lazy(Generic[T]):
     @classmethod
     def from_serialized(cls, d: dict):
         """Convert a dict-serialized object into an lazy object"""
-        target_cls = import_dotted_string(d.pop("__type__"), safe=False)
+        target_cls = cached_import(d.pop("__type__"))
         for key, value in d.items():
             if isinstance(value, dict) and "__type__" in value:
                 d[key] = cls.from_serialized(value)
@@ -239,30 +406,28 @@ class lazy(Generic[T]):
 
     def __rshift__(self, other: "lazy[T]") -> Any:
         """Chain two lazy objects together"""
-        from theflow.base import Function, SequentialFunction
+        from theflow.base import SequentialFunction
 
-        if not isinstance(other, lazy):
-            raise ValueError(f"Cannot chain lazy and non-lazy objects: {other}")
+        return self._chain(other, SequentialFunction)
 
-        if not issubclass(other._cls, Function) or not issubclass(self._cls, Function):
-            raise ValueError("Can only chain lazy Function")
+    def __floordiv__(self, other: "lazy[T]") -> Any:
+        """Chain two lazy objects together"""
+        from theflow.base import ConcurrentFunction
 
-        funcs = []
-        if issubclass(self._cls, SequentialFunction):
-            funcs.extend(self._params.get("funcs", []))
-        else:
-            funcs.append(self)
+        return self._chain(other, ConcurrentFunction)
 
-        if issubclass(other._cls, SequentialFunction):
-            funcs.extend(other._params.get("funcs", []))
-        else:
-            funcs.append(other)
+    def _chain(self, other: "lazy[T]", container_cls: type) -> Any:
+        """Chain two lazy Functions into a lazy `container_cls`
 
-        return lazy(SequentialFunction, funcs=funcs)
+        Args:
+            other: the lazy Function to chain after this one
+            container_cls: SequentialFunction or ConcurrentFunction. The funcs of a
+                lazy `container_cls` are flattened into the chain
 
-    def __floordiv__(self, other: "lazy[T]") -> Any:
-        """Chain two lazy objects together"""
-        from theflow.base import ConcurrentFunction, Function
+        Returns:
+            the lazy `container_cls` with the chained funcs
+        """
+        from theflow.base import Function
 
         if not isinstance(other, lazy):
             raise ValueError(f"Cannot chain lazy and non-lazy objects: {other}")
@@ -271,14 +436,10 @@ class lazy(Generic[T]):
             raise ValueError("Can only chain lazy Function")
 
         funcs = []
-        if issubclass(self._cls, ConcurrentFunction):
-            funcs.extend(self._params.get("funcs", []))
-        else:
-            funcs.append(self)
-
-        if issubclass(other._cls, ConcurrentFunction):
-            funcs.extend(other._params.get("funcs", []))
-        else:
-            funcs.append(other)
+        for each in (self, other):
+            if issubclass(each._cls, container_cls):
+                funcs.extend(each._params.get("funcs", []))
+            else:
+                funcs.append(each)
 
-        return lazy(ConcurrentFunction, funcs=funcs)
+        return lazy(container_cls, funcs=funcs)
@@ -1,23 +1,45 @@
 import multiprocessing
-import multiprocessing.managers
-from typing import TYPE_CHECKING, Dict, List, cast
+import os
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
 
 if TYPE_CHECKING:
     from ..base import Function
 
 
-def _run_node(task):
-    obj: "Function" = task[0]
-    child_name: str = task[1]
-    params: Dict = task[2]
-    lock = task[3]
+# the parent Function and the child name of the worker process, set once per worker
+# by `_init_worker` so they aren't pickled along with every task
+_worker_obj: "Optional[Function]" = None
+_worker_child_name: str = ""
 
-    with lock:
-        node = getattr(obj, child_name)
+
+def _init_worker(obj: "Function", child_name: str):
+    global _worker_obj, _worker_child_name
+    _worker_obj, _worker_child_name = obj, child_name
+
+
+def _run_node(task: Tuple[int, Dict]):
+    call_idx, params = task
+
+    # the call index is assigned by the parent, so that the child is named as if the
+    # tasks were run one after another, e.g. "child", "child[1]", "child[2]"...
+    childs_called = _worker_obj._ff_childs_called  # type: ignore
+    if call_idx:
+        childs_called[_worker_child_name] = call_idx
+    else:
+        childs_called.pop(_worker_child_name, None)
+
+    node = getattr(_worker_obj, _worker_child_name)
     return node(**params)
 
 
-def parallel(obj: "Function", child_name: str, tasks: List[Dict], **kwargs):
+def parallel(
+    obj: "Function",
+    child_name: str,
+    tasks: List[Dict],
+    ordered: bool = True,
+    chunksize: Optional[int] = None,
+    **kwargs,
+):
     """Run a node in parallel with multiprocessing.
 
     This helper function allows accurately keeping track of the the number of time the
@@ -27,19 +49,34 @@ def parallel(obj: "Function", child_name: str, tasks: List[Dict], **kwargs):
         obj (Function): Function object
         child_name (str): Child name
         tasks (List[Dict]): List of parameters for each task
+        ordered (bool): If True, yield the results in the order of the tasks.
+            Otherwise, yield them as they finish
+        chunksize (int): Number of tasks sent to a worker at a time. If None, split
+            the tasks into about 4 chunks per process
         kwargs: Keyword arguments for multiprocessing.Pool
     """
-    manager = None
-    try:
-        manager = multiprocessing.Manager()
-        obj._ff_childs_called = cast("dict", manager.dict(obj._ff_childs_called))
-        lock = manager.Lock()
+    if len(tasks) <= 1 or kwargs.get("processes") == 1:
+        # nothing runs concurrently, run in this process without spinning up the
+        # pool
+        for task in tasks:
+            yield getattr(obj, child_name)(**task)
+        return
 
-        tasks_mp = [(obj, child_name, task, lock) for task in tasks]
-        with multiprocessing.Pool(**kwargs) as pool:
-            yield from pool.imap(_run_node, tasks_mp)
+    start_idx = obj._ff_childs_called.get(child_name, 0)
+    if chunksize is None:
+        processes = kwargs.get("processes") or os.cpu_count() or 1
+        chunksize = max(1, len(tasks) // (4 * processes))
+
+    try:
+        with multiprocessing.Pool(
+            initializer=_init_worker, initargs=(obj, child_name), **kwargs
+        ) as pool:
+            indexed_tasks = enumerate(tasks, start=start_idx)
+            if ordered:
+                yield from pool.imap(_run_node, indexed_tasks, chunksize=chunksize)
+            else:
+                yield from pool.imap_unordered(
+                    _run_node, indexed_tasks, chunksize=chunksize
+                )
     finally:
-        if isinstance(obj._ff_childs_called, multiprocessing.managers.DictProxy):
-            obj._ff_childs_called = obj._ff_childs_called.copy()
-        if manager is not None:
-            manager.shutdown()
+        obj._ff_childs_called[child_name] = start_idx + len(tasks)
@@ -1,9 +1,15 @@
+import os
 import re
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Optional, Union
+from typing import Dict, List, Optional, Tuple, Union
 
 THEFLOW_DIR = ".theflow"
 
+# the found directories, by (loc, name). Misses aren't cached, since the directory
+# may be created later (e.g. `default_theflow_path(create=True)`)
+_FOUND_UPWARD: Dict[Tuple[str, str], str] = {}
+
 
 def project_root(loc: Optional[Union[str, Path]] = None) -> Path:
     """Get the root directory of the project (contains .git/). Return cwd if .git/
@@ -16,15 +22,9 @@ def project_root(loc: Optional[Union[str, Path]] = None) -> Path:
     Returns:
         the root directory of the project, or None if not found
     """
-    if loc is None:
-        loc = Path.cwd()
-    loc = Path(loc)
-    while loc != loc.parent:
-        if (loc / ".git").exists():
-            return loc
-        loc = loc.parent
-
-    return Path.cwd()
+    loc = Path.cwd() if loc is None else Path(loc)
+    root = _find_upward(str(loc), ".git")
+    return Path.cwd() if root is None else Path(root)
 
 
 def get_theflow_path(loc: Optional[Union[str, Path]]) -> Optional[Path]:
@@ -38,14 +38,43 @@ def get_theflow_path(loc: Optional[Union[str, Path]]) -> Optional[Path]:
         the theflow directory, or None if not found
     """
     loc = Path.cwd() if loc is None else Path(loc)
-    while loc != loc.parent:
-        if (loc / THEFLOW_DIR).exists():
-            return loc / THEFLOW_DIR
-        loc = loc.parent
+    parent = _find_upward(str(loc), THEFLOW_DIR)
+    return None if parent is None else Path(parent, THEFLOW_DIR)
+
+
+def _find_upward(loc: str, name: str) -> Optional[str]:
+    """Find the closest directory, from `loc` up, that contains `name`
+
+    The found directory is cached, call `clear_path_cache` if a closer one is
+    created, or if it's removed or moved.
+
+    Args:
+        loc: the directory to start searching from
+        name: the file or directory to look for
+
+    Returns:
+        the directory that contains `name`, or None if not found. The filesystem
+            root isn't checked
+    """
+    key = (loc, name)
+    if key in _FOUND_UPWARD:
+        return _FOUND_UPWARD[key]
+
+    parent = os.path.dirname(loc)
+    while loc != parent:
+        if os.path.exists(os.path.join(loc, name)):
+            _FOUND_UPWARD[key] = loc
+            return loc
+        loc, parent = parent, os.path.dirname(parent)
 
     return None
 
 
+def clear_path_cache():
+    """Clear the cached results of `project_root` and `get_theflow_path`"""
+    _FOUND_UPWARD.clear()
+
+
 def default_theflow_path(
     loc: Union[None, str, Path] = None, create: bool = False
 ) -> Path:
@@ -74,6 +103,7 @@ def default_theflow_path(
     flow_path = project_root(loc) / THEFLOW_DIR
     if create:
         flow_path.mkdir(exist_ok=True, parents=True)
+        clear_path_cache()
 
     return flow_path
 
@@ -85,7 +115,6 @@ def temp_path() -> str:
         the default temporary directory
     """
     import getpass
-    import os
     import tempfile
 
     default: str = os.environ.get("THEFLOW_TEMP_PATH", "")
@@ -101,6 +130,24 @@ def temp_path() -> str:
     return str(path)
 
 
+@lru_cache(maxsize=512)
+def compile_name_pattern(pattern: str) -> "re.Pattern[str]":
+    """Compile a wildcard name pattern into a regular expression
+
+    The compiled pattern is cached, so matching many names against the same pattern
+    (e.g. the `from` step checked by every step of a pipeline) only builds the regex
+    once.
+
+    Args:
+        pattern: the pattern, where "*" matches a single dot-delimited component
+
+    Returns:
+        the compiled regular expression
+    """
+    pattern_parts: List[str] = [re.escape(part) for part in pattern.split("*")]
+    return re.compile(r"[^.]+".join(pattern_parts))
+
+
 def is_name_matched(name: str, pattern: str) -> bool:
     """Check if a name matches a pattern
 
@@ -114,9 +161,9 @@ def is_name_matched(name: str, pattern: str) -> bool:
     Returns:
         True if the name matches the pattern, False otherwise
     """
-    pattern_parts: List[str] = [re.escape(part) for part in pattern.split("*")]
-    regex_pattern: str = r"^" + r"[^.]+".join(pattern_parts) + r"$"
-    return re.findall(regex_pattern, name) != []
+    if "*" not in pattern:
+        return name == pattern
+    return compile_name_pattern(pattern).fullmatch(name) is not None
 
 
 def is_parent_of_child(parent: str, child: str) -> bool:
@@ -137,9 +184,14 @@ def is_parent_of_child(parent: str, child: str) -> bool:
     Returns:
         True if the parent is a parent of the child, False otherwise
     """
-    parent, child = parent.strip("."), child.strip(".")
-    pattern = ".".join(child.split(".")[:-1])
-    return is_name_matched(parent, pattern)
+    return is_name_matched(parent.strip("."), _parent_pattern(child))
+
+
+@lru_cache(maxsize=512)
+def _parent_pattern(child: str) -> str:
+    """Get the pattern of the direct parent of a child name, cached since the same
+    child pattern is checked against many parents"""
+    return child.strip(".").rpartition(".")[0]
 
 
 if __name__ == "__main__":
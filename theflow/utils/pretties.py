@@ -1,6 +1,3 @@
-import re
-
-
 def reindent_docstring(docin: str) -> str:
     """Remove beginning whitespace in a docstring
 
@@ -16,15 +13,20 @@ def reindent_docstring(docin: str) -> str:
     if not docin:
         return ""
 
-    whitespaces = re.findall(r"\n[ \t]+", docin)
-    if whitespaces:
-        min_whitespace = min(whitespaces)[1:]
-        lines = []
-        for line in docin.splitlines():
-            if line.startswith(min_whitespace):
-                line = line[len(min_whitespace) :]
-            lines.append(line)
-        docin = "\n".join(lines).strip()
+    lines = docin.splitlines()
+    min_whitespace = ""
+    for line in lines[1:]:
+        stripped = line.lstrip(" \t")
+        if stripped and stripped != line:
+            whitespace = line[: len(line) - len(stripped)]
+            if not min_whitespace or whitespace < min_whitespace:
+                min_whitespace = whitespace
+
+    if min_whitespace:
+        size = len(min_whitespace)
+        docin = "\n".join(
+            line[size:] if line.startswith(min_whitespace) else line for line in lines
+        ).strip()
     return docin
 
 
@@ -42,12 +44,20 @@ def flatten_dict(indict: dict) -> dict:
         flattened dict
     """
     outdict = {}
-    for key, value in indict.items():
-        if isinstance(value, dict):
-            for subkey, subvalue in flatten_dict(value).items():
-                outdict[f"{key}.{subkey}"] = subvalue
-        else:
+    # (key prefix, remaining items) of the dicts being flattened, depth-first so the
+    # keys keep the same order as in the nested dict
+    stack = [("", iter(indict.items()))]
+    while stack:
+        prefix, items = stack[-1]
+        for key, value in items:
+            if prefix:
+                key = f"{prefix}{key}"
+            if isinstance(value, dict):
+                stack.append((f"{key}.", iter(value.items())))
+                break
             outdict[key] = value
+        else:
+            stack.pop()
     return outdict
 
 
@@ -67,11 +77,12 @@ def unflatten_dict(indict: dict) -> dict:
     outdict: dict = {}
     for key, value in indict.items():
         key = key.strip(".")
+        if "." not in key:
+            outdict[key] = value
+            continue
         subkeys = key.split(".")
         subdict = outdict
         for subkey in subkeys[:-1]:
-            if subkey not in subdict:
-                subdict[subkey] = {}
-            subdict = subdict[subkey]
+            subdict = subdict.setdefault(subkey, {})
         subdict[subkeys[-1]] = value
     return outdict
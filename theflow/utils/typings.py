@@ -5,6 +5,7 @@ Consider these as experimental due to very naive implementation that for sure ca
 handle uncommon cases.
 """
 import inspect
+from functools import lru_cache
 from typing import _GenericAlias  # type: ignore
 from typing import Any, Callable, Union, get_args, get_origin
 
@@ -33,25 +34,44 @@ def expand_types(annotation) -> list:
     return result
 
 
+@lru_cache(maxsize=4096)
+def _expand_types(annotation) -> tuple:
+    """Cached `expand_types`, as a tuple so the result can't be modified"""
+    return tuple(expand_types(annotation))
+
+
 def is_compatible_with(type1, type2) -> bool:
     """Check if the annotation type1 is at slightest compatible with type2
 
     Slightest compatibility happens when there is at least 1 type in type1 that is
     a subclass of at least 1 type in type2
     """
-    type1s = expand_types(type1)
-    type2s = expand_types(type2)
+    try:
+        type1s, type2s = _expand_types(type1), _expand_types(type2)
+    except TypeError:
+        # unhashable annotation, can't be cached
+        type1s, type2s = tuple(expand_types(type1)), tuple(expand_types(type2))
+
     if Any in type1s:
         return True
     if Any in type2s:
         return True
 
+    try:
+        if not set(type1s).isdisjoint(type2s):
+            # the same type on both sides, no need to check subclasses
+            return True
+    except TypeError:
+        pass
+
     for each_1 in type1s:
+        if not isinstance(each_1, type):
+            continue
         for each_2 in type2s:
             try:
                 if issubclass(each_1, each_2):
                     return True
-            except Exception:
+            except TypeError:
                 continue
 
     return False
@@ -62,6 +82,9 @@ def input_signature(
 ) -> tuple[dict, bool, bool]:
     """Get the input signature of a function or method
 
+    The signature is cached per function (a bound method is cached on its underlying
+    function), since the same `run` is inspected for every node that uses it.
+
     Args:
         func: the function or method to get the signature
         ignore_bound: ignore the first argument if it is self or cls
@@ -71,11 +94,49 @@ def input_signature(
         - a bool indicating if the function has *args
         - a bool indicating if the function has **kwargs
     """
-    args = inspect.signature(func).parameters
+    is_method = inspect.ismethod(func)
+    if is_method:
+        func = func.__func__  # type: ignore
+
+    try:
+        type_annotation, has_args, has_kwargs = _input_signature(
+            func, ignore_bound, is_method
+        )
+    except TypeError:
+        # unhashable callable, can't be cached
+        type_annotation, has_args, has_kwargs = _input_signature.__wrapped__(
+            func, ignore_bound, is_method
+        )
+
+    # copy, so that the caller can modify it without affecting the cache
+    return dict(type_annotation), has_args, has_kwargs
+
+
+@lru_cache(maxsize=2048)
+def _input_signature(
+    func: Callable, ignore_bound: bool, is_method: bool
+) -> tuple[dict, bool, bool]:
+    """Get the input signature of a function, see `input_signature`
+
+    Args:
+        func: the function to get the signature
+        ignore_bound: ignore the first argument if it is self or cls
+        is_method: if True, `func` is the function of a bound method, so its first
+            positional argument is bound and skipped
+    """
+    args = list(inspect.signature(func).parameters.items())
+    if (
+        is_method
+        and args
+        and args[0][1].kind
+        in (inspect.Parameter.POSITIONAL_ONLY, inspect.Parameter.POSITIONAL_OR_KEYWORD)
+    ):
+        args = args[1:]
+
     type_annotation = {}
     bounds = {"self", "cls"}
     has_args, has_kwargs = False, False
-    for name, arg in args.items():
+    for name, arg in args:
         if name in bounds and ignore_bound:
             continue
         if arg.kind == inspect.Parameter.VAR_POSITIONAL:
@@ -98,12 +159,27 @@ def input_signature(
 def output_signature(func: Callable) -> Any:
     """Get the output signature of a function or method
 
+    The signature is cached per function, as in `input_signature`.
+
     Args:
         func: the function or method to get the signature
 
     Returns:
         the return type annotation
     """
+    if inspect.ismethod(func):
+        func = func.__func__  # type: ignore
+
+    try:
+        return _output_signature(func)
+    except TypeError:
+        # unhashable callable, can't be cached
+        return _output_signature.__wrapped__(func)
+
+
+@lru_cache(maxsize=2048)
+def _output_signature(func: Callable) -> Any:
+    """Get the output signature of a function, see `output_signature`"""
     annot = inspect.signature(func).return_annotation
     if annot is inspect.Signature.empty:
         annot = Any
@@ -2,7 +2,13 @@ from __future__ import annotations
 
 import ast
 import inspect
-from collections import defaultdict
+import logging
+import os
+import sys
+import weakref
+from typing import Any, Callable
+
+logger = logging.getLogger(__name__)
 
 IGNORE = (
     ast.Call,
@@ -21,6 +27,8 @@ IGNORE = (
     ast.If,
     ast.IfExp,
 )
+# class -> (mtime of its source file, parsed source), see `_parse_class`
+_TREE_CACHE: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
 
 
 def trace_pipelne_run(cls) -> list:
@@ -32,24 +40,78 @@ def trace_pipelne_run(cls) -> list:
     Returns:
         list: the logic flow of the pipeline run (suitable for dot)
     """
-    tree = ast.parse(inspect.getsource(cls))
+    tree = _parse_class(cls)
+    run_node = None
+    for stmt in tree.body:
+        if isinstance(stmt, ast.ClassDef) and stmt.name == cls.__name__:
+            run_node = _get_run_method(stmt)
+            break
+
+    if run_node is None:
+        return []
+
+    # only the run method is walked, not the rest of the class
     analyzer = PipelineRunTracer()
-    analyzer.visit(tree)
+    analyzer.visit(run_node)
 
     return analyzer.logic_flow
 
 
+def _get_run_method(node: ast.ClassDef) -> ast.FunctionDef | None:
+    """Get the `run` method of a parsed class, None if it doesn't define one"""
+    for stmt in node.body:
+        if isinstance(stmt, ast.FunctionDef) and stmt.name == "run":
+            return stmt
+    return None
+
+
+def _parse_class(cls) -> ast.Module:
+    """Parse the source code of a class, cached until its source file changes
+
+    Args:
+        cls: the class
+
+    Returns:
+        ast.Module: the parsed source code
+    """
+    try:
+        mtime = os.path.getmtime(inspect.getsourcefile(cls))  # type: ignore
+    except (TypeError, OSError):
+        mtime = None
+
+    cached = _TREE_CACHE.get(cls)
+    if cached is not None and mtime is not None and cached[0] == mtime:
+        return cached[1]
+
+    tree = ast.parse(inspect.getsource(cls))
+    _TREE_CACHE[cls] = (mtime, tree)
+    return tree
+
+
 def get_ast_node_name(node) -> str:
     """Get human-readable name of an ast node
 
     Args:
         node: ast node
 
+    Returns:
+        str: human-readable name of the ast node
+    """
+    return _get_ast_node_name(node, get_ast_node_name)
+
+
+def _get_ast_node_name(node, name_of: Callable) -> str:
+    """Get human-readable name of an ast node
+
+    Args:
+        node: ast node
+        name_of: used to get the name of the child nodes
+
     Returns:
         str: human-readable name of the ast node
     """
     if isinstance(node, ast.Attribute):
-        return f"{get_ast_node_name(node.value)}.{node.attr}"
+        return f"{name_of(node.value)}.{node.attr}"
     elif isinstance(node, ast.Name):
         return node.id
     elif isinstance(node, ast.FunctionDef):
@@ -59,159 +121,278 @@ def get_ast_node_name(node) -> str:
     elif isinstance(node, ast.Constant):
         return node.value
     elif isinstance(node, ast.Call):
-        return get_ast_node_name(node.func)
+        return name_of(node.func)
     elif isinstance(node, ast.JoinedStr):
-        text = ""
-        for value in node.values:
-            text += get_ast_node_name(value)
-        return text
+        # the parts aren't always str, e.g. the constant of `f"{1}"`
+        return "".join([str(name_of(value)) for value in node.values])
     elif isinstance(node, ast.FormattedValue):
-        return get_ast_node_name(node.value)
+        return name_of(node.value)
     else:
         return node
 
 
+class Scope:
+    """The variables created in a block of the run, linked to the enclosing block
+
+    Args:
+        parent: the scope of the enclosing block, None for the outermost one
+    """
+
+    __slots__ = ("vars", "parent", "indent")
+
+    def __init__(self, parent: Scope | None = None):
+        self.vars: dict[str, Any] = {}  # variable name -> its creator(s)
+        self.parent = parent
+        # one space per nesting level, built once per block for the debug messages
+        self.indent: str = " " if parent is None else parent.indent + " "
+
+
+def _build_dispatch(cls) -> dict:
+    """Map the ast node types to the unbound `visit_<type>` methods of `cls`"""
+    dispatch = {}
+    for attr in dir(cls):
+        if attr.startswith("visit_"):
+            meth = getattr(cls, attr)
+            if meth is getattr(ast.NodeVisitor, attr, None):
+                # e.g. the legacy `visit_Constant`, which ends up in generic_visit
+                continue
+            node_type = getattr(ast, attr[len("visit_") :], None)
+            if isinstance(node_type, type) and issubclass(node_type, ast.AST):
+                dispatch[node_type] = meth
+    return dispatch
+
+
 class PipelineRunTracer(ast.NodeVisitor):
+    # ast.NodeVisitor has no __slots__ so instances still get a __dict__, but these
+    # attributes, read for every visited node, go through the slot descriptors
+    __slots__ = (
+        "_edges",
+        "in_run",
+        "_dispatch",
+        "_scope",
+        "_last_call",
+        "_debug",
+        "_name_cache",
+    )
+
+    # exact-type lookup, the ast node classes aren't subclassed
+    _IGNORE = frozenset(IGNORE)
+    # node type -> unbound visitor, built once per class rather than looking up
+    # "visit_" + class name per node, see `_build_dispatch`
+    _DISPATCH: dict = {}
+    # the visitors used until the run method is entered, the other nodes are skipped
+    _PRERUN_DISPATCH: dict = {}
+    _PRERUN_TYPES = (ast.Module, ast.ClassDef, ast.FunctionDef)
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._set_dispatch()
+
+    @classmethod
+    def _set_dispatch(cls):
+        cls._DISPATCH = _build_dispatch(cls)
+        cls._PRERUN_DISPATCH = {
+            node_type: meth
+            for node_type, meth in cls._DISPATCH.items()
+            if node_type in cls._PRERUN_TYPES
+        }
+
     def __init__(self):
-        self.logic_flow = []
+        self._edges: dict[tuple, None] = {}
         self.in_run = False
-        self._stacks: list[dict[str, list]] = [defaultdict(list)]
+        self._dispatch = self._PRERUN_DISPATCH
+        self._scope = Scope()
         self._last_call = None
+        # checked once, the trace messages are only built when debug logging is on
+        self._debug = logger.isEnabledFor(logging.DEBUG)
+        # id(node) -> name, the nodes are alive for as long as the tree is traced
+        self._name_cache: dict[int, Any] = {}
+
+    @property
+    def logic_flow(self) -> list:
+        """The (source, destination) edges of the run, in the order they are found"""
+        return list(self._edges)
+
+    def _emit_edge(self, src, dst):
+        """Add an edge to the logic flow, an edge is only kept once"""
+        self._edges[(src, dst)] = None
+
+    def get_name(self, node) -> str:
+        """Get human-readable name of an ast node, cached per node
+
+        Args:
+            node: ast node
+
+        Returns:
+            str: human-readable name of the ast node
+        """
+        key = id(node)
+        try:
+            return self._name_cache[key]
+        except KeyError:
+            name = _get_ast_node_name(node, self.get_name)
+            if type(name) is str:
+                # the same names make most of the edges, share a single copy
+                name = sys.intern(name)
+            self._name_cache[key] = name
+            return name
 
     def get_creator_of(self, name, default=None):
         """Find the creator of a variable"""
-        for idx in range(len(self._stacks) - 1, -1, -1):
-            if name in self._stacks[idx]:
-                return self._stacks[idx][name]
+        scope: Scope | None = self._scope
+        while scope is not None:
+            if name in scope.vars:
+                return scope.vars[name]
+            scope = scope.parent
 
         return default
 
     def set_creator_of(self, name, value):
-        """Set creator of a value"""
-        self._stacks[-1][name] = value
+        """Set creator of a value
+
+        The creators are kept as a tuple of unique producers, in the order they are
+        found, so that merging the branches of a condition doesn't duplicate them.
+        """
+        if isinstance(value, (list, tuple)):
+            value = tuple(dict.fromkeys(value))
+        else:
+            # a single producer, which isn't always a str, e.g. the ast node of
+            # `self.steps[0](x)` whose name isn't resolved
+            value = (value,)
+        self._scope.vars[name] = value
 
     def stack_begin(self):
-        stack: dict[str, list] = defaultdict(list)
-        self._stacks.append(stack)
-        return stack
+        """Enter a new block scope"""
+        self._scope = Scope(self._scope)
+        return self._scope.vars
 
     def stack_end(self):
-        return self._stacks.pop()
+        """Leave the current block scope, return its variables"""
+        scope = self._scope
+        self._scope = scope.parent  # type: ignore
+        return scope.vars
 
     def visit(self, node):
+        if self._debug and self.in_run:
+            if type(node) not in self._IGNORE:
+                logger.debug("%sUnhandled: %s", self.indent(), node)
+        meth = self._dispatch.get(type(node))
+        if meth is not None:
+            return meth(self, node)
         if self.in_run:
-            if not isinstance(node, IGNORE):
-                print(node)
-        return super().visit(node)
+            return self.generic_visit(node)
+
+    def generic_visit(self, node):
+        """Visit the children of a node
+
+        Same as `ast.NodeVisitor.generic_visit`, but dispatches the children directly
+        instead of going through `visit` for each of them.
+        """
+        if self._debug:
+            # go through `visit`, which logs the unhandled nodes
+            return super().generic_visit(node)
+
+        cls = type(self)
+        dispatch, generic_visit = cls._DISPATCH, cls.generic_visit
+        for field in node._fields:
+            value = getattr(node, field, None)
+            if type(value) is list:
+                for item in value:
+                    if isinstance(item, ast.AST):
+                        dispatch.get(type(item), generic_visit)(self, item)
+            elif isinstance(value, ast.AST):
+                dispatch.get(type(value), generic_visit)(self, value)
 
     def visit_Assign(self, node):
-        print(f"{self.indent()}Assign:")
+        if self._debug:
+            logger.debug("%sAssign:", self.indent())
 
         # TODO: seems Assign doesn't need stack
         self.generic_visit(node)
         for target in node.targets:
-            name = get_ast_node_name(target)
+            name = self.get_name(target)
             if self._last_call is not None:
                 self.set_creator_of(name, self._last_call)
                 self._last_call = None
 
     def visit_Name(self, node):
-        print(f"{self.indent()}Name: {get_ast_node_name(node)}")
+        # a leaf for the logic flow, names are resolved by the parent node
+        pass
 
     def indent(self):
-        return " " * len(self._stacks)
+        return self._scope.indent
+
+    def visit_Module(self, node):
+        # only the classes can contain the pipeline run
+        for stmt in node.body:
+            if isinstance(stmt, ast.ClassDef):
+                self.visit(stmt)
+
+    def visit_ClassDef(self, node):
+        # only the `run` method is traced, skip the other methods, the class
+        # attributes, the bases and the decorators
+        run_node = _get_run_method(node)
+        if run_node is not None:
+            self.visit(run_node)
 
     def visit_FunctionDef(self, node):
         if node.name != "run":
             return
 
         self.in_run = True
-        print(f"{self.indent()}Function: {get_ast_node_name(node)}")
+        self._dispatch = self._DISPATCH
+        if self._debug:
+            logger.debug("%sFunction: %s", self.indent(), self.get_name(node))
 
-        return self.generic_visit(node)
+        # the signature and the decorators don't take part in the logic flow
+        for stmt in node.body:
+            self.visit(stmt)
 
     def visit_Call(self, node):
-        if not self.in_run:
-            return
-
-        # determine function name
-        node_name = get_ast_node_name(node)
+        # determine function name, and the kwargs in the same pass
+        ff_name = None
+        other_kws = []
         for kw in node.keywords:
             if kw.arg == "_ff_name":
-                node_name = get_ast_node_name(kw.value)
-                break
+                ff_name = self.get_name(kw.value)
+            else:
+                other_kws.append(kw.value)
+        node_name = ff_name if ff_name is not None else self.get_name(node)
 
-        print(f"{self.indent()}Call: {node_name}")
+        if self._debug:
+            logger.debug("%sCall: %s", self.indent(), node_name)
 
         # determine args relation
         for arg in node.args:
-            if isinstance(arg, ast.Call):
-                self.visit(arg)
-                self.logic_flow.append((self._last_call, node_name))
-                self._last_call = None
-            elif isinstance(arg, ast.Name):
-                from_node = self.get_creator_of(arg.id, "__begin__")
-                if isinstance(from_node, str):
-                    self.logic_flow.append((from_node, node_name))
-                else:
-                    for each in from_node:
-                        self.logic_flow.append((each, node_name))
-            else:
-                print("Else condition")
+            self._handle_operand(arg, node_name)
 
         # determine kwargs relation
-        for kw in node.keywords:
-            if kw.arg == "_ff_name":
-                continue
-            if isinstance(arg, ast.Call):
-                self.visit(arg)
-                self.logic_flow.append((self._last_call, node_name))
-                self._last_call = None
-            elif isinstance(kw.value, ast.Name):
-                from_node = self.get_creator_of(kw.value.id, "__begin__")
-                if isinstance(from_node, str):
-                    self.logic_flow.append((from_node, node_name))
-                else:
-                    for each in from_node:
-                        self.logic_flow.append((each, node_name))
-            else:
-                print("Else condition")
+        for value in other_kws:
+            self._handle_operand(value, node_name)
         self._last_call = node_name
 
+    def _handle_operand(self, value, dst_name):
+        """Emit the edges from the producers of an argument to the called node"""
+        # exact-type checks, the ast node classes aren't subclassed
+        value_type = type(value)
+        if value_type is ast.Call:
+            self.visit_Call(value)
+            if self._last_call is not None:
+                self._emit_edge(self._last_call, dst_name)
+                self._last_call = None
+        elif value_type is ast.Name:
+            for each in self.get_creator_of(value.id, ("__begin__",)):
+                self._emit_edge(each, dst_name)
+        elif self._debug:
+            logger.debug("%sUnhandled operand: %s", self.indent(), ast.dump(value))
+
     def visit_Attribute(self, node):
-        print(f"{self.indent()}Attribute: {get_ast_node_name(node)}")
-        # return self.generic_visit(node)
+        # a leaf for the logic flow, e.g. the `self.step` of `self.step(x)`
+        pass
 
     def visit_arg(self, node):
-        print(f"{self.indent()}Arg: {get_ast_node_name(node)}")
-
-    def visit_arguments(self, node):
-        print(f"{self.indent()}Arguments:")
-        self.generic_visit(node)
-
-    def visit_keyword(self, node):
-        print(f"{self.indent()}Keyword: {get_ast_node_name(node)}")
-        self.generic_visit(node)
-
-    def visit_Load(self, node):
-        print(f"{self.indent()}Load: {get_ast_node_name(node)}")
-        return self.generic_visit(node)
-
-    def visit_Constant(self, node):
-        print(f"{self.indent()}Constant: {get_ast_node_name(node)}")
-        return self.generic_visit(node)
-
-    def visit_Return(self, node):
-        print(f"{self.indent()}Return: {get_ast_node_name(node)}")
-        self.generic_visit(node)
-
-    def visit_Dict(self, node):
-        print(f"{self.indent()}Dict: {get_ast_node_name(node)}")
-        self.generic_visit(node)
-
-    def visit_Subscript(self, node):
-        print(f"{self.indent()}Subscript: {get_ast_node_name(node)}")
-        self.generic_visit(node)
+        # a leaf for the logic flow
+        pass
 
     def visit_If(self, node):
         self.generic_visit(node.test)
@@ -225,45 +406,43 @@ class PipelineRunTracer(ast.NodeVisitor):
             self.visit(each)
         creator2 = self.stack_end()
 
-        creator = {}
-        creator.update(creator1)
+        creator = dict(creator1)
         for key, value in creator2.items():
             if key in creator:
-                value1 = [value] if not isinstance(value, list) else value
-                value2 = (
-                    [creator[key]]
-                    if not isinstance(creator[key], list)
-                    else creator[key]
-                )
-                creator[key] = value1 + value2
+                # union of both branches' producers, without duplicates
+                creator[key] = tuple(dict.fromkeys(value + creator[key]))
             else:
                 creator[key] = value
-        self._stacks[-1].update(creator)
+        self._scope.vars.update(creator)
 
     def report(self):
         for each_from, each_to in self.logic_flow:
             print(f"{each_from} -> {each_to}")
 
     def visit_IfExp(self, node):
-        print(f"{self.indent()}IfExp: {get_ast_node_name(node)}")
+        if self._debug:
+            logger.debug("%sIfExp:", self.indent())
 
         self.visit(node.test)
         test = self._last_call
 
-        last_call = []
-        self.visit(node.body)
-        if self._last_call is not None:
-            if test is not None:
-                self.logic_flow.append((test, self._last_call))
-            last_call.append(self._last_call)
-            self._last_call = None
-
-        self.visit(node.orelse)
-        if self._last_call is not None:
-            if test is not None:
-                self.logic_flow.append((test, self._last_call))
-            last_call.append(self._last_call)
-            self._last_call = None
+        last_call: list = []
+        for branch in (node.body, node.orelse):
+            self.visit(branch)
+            if self._last_call is not None:
+                # a nested conditional expression leaves its branches' producers
+                if isinstance(self._last_call, (list, tuple)):
+                    last_call.extend(self._last_call)
+                else:
+                    last_call.append(self._last_call)
+                self._last_call = None
+
+        if test is not None:
+            # added at once, in the same order as the branches
+            self._edges.update(dict.fromkeys([(test, each) for each in last_call]))
 
         if last_call:
             self._last_call = last_call
+
+
+PipelineRunTracer._set_dispatch()